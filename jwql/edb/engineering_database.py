@@ -45,9 +45,15 @@ Notes
 """
 import calendar
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import copy
 from datetime import datetime, timedelta
+from functools import lru_cache
 from numbers import Number
 import os
+import tempfile
+import threading
+import time
 import warnings
 
 from astropy.io import ascii
@@ -58,7 +64,7 @@ import astropy.units as u
 from astroquery.mast import Mast
 from bokeh.embed import components
 from bokeh.layouts import column
-from bokeh.models import BoxAnnotation, ColumnDataSource, DatetimeTickFormatter, HoverTool, Range1d
+from bokeh.models import BoxAnnotation, ColumnDataSource, DatetimeTickFormatter, HoverTool, Range1d, Span
 from bokeh.plotting import figure, output_file, show, save
 import numpy as np
 
@@ -70,14 +76,364 @@ from jwql.utils.utils import get_config
 MAST_EDB_MNEMONIC_SERVICE = 'Mast.JwstEdb.Mnemonics'
 MAST_EDB_DICTIONARY_SERVICE = 'Mast.JwstEdb.Dictionary'
 
+# Results of recent get_mnemonic queries are kept in memory for a short time, so that
+# repeated requests for the same mnemonic and time range do not go back to the EDB
+MNEMONIC_CACHE_SIZE = 128
+MNEMONIC_CACHE_TTL = 60.  # seconds
+_MNEMONIC_CACHE = OrderedDict()
+_MNEMONIC_CACHE_LOCK = threading.Lock()
+
+# Rotation of the date labels on the x axis of the plots, in radians
+DATE_LABEL_ORIENTATION = np.pi / 4
+
+# Date formats for the x axis tick labels of the plots, at each time scale
+DATE_TICK_FORMATS = {'microseconds': ["%d %b %H:%M:%S.%3N"],
+                     'seconds': ["%d %b %H:%M:%S.%3N"],
+                     'hours': ["%d %b %H:%M"],
+                     'days': ["%d %b %H:%M"],
+                     'months': ["%d %b %Y %H:%M"],
+                     'years': ["%d %b %Y"]
+                     }
+
 # Temporary until JWST operations: switch to test string for MAST request URL
 ON_GITHUB_ACTIONS = '/home/runner' in os.path.expanduser('~') or '/Users/runner' in os.path.expanduser('~')
 if not ON_GITHUB_ACTIONS:
     Mast._portal_api_connection.MAST_REQUEST_URL = get_config()['mast_request_url']
 
 
+def _block_median_times(dates, blocks):
+    """Calculate the median time of each block of data at once. This gives the
+    same results as calling ``calc_median_time`` on each block, i.e. the time
+    halfway between the first and last dates in the block.
+
+    Parameters
+    ----------
+    dates : numpy.ndarray
+        Sorted ``datetime64[us]`` dates
+
+    blocks : numpy.ndarray
+        Index numbers corresponding to the beginning of each block, with the
+        final element marking the end of the last block
+
+    Returns
+    -------
+    med_times : numpy.ndarray
+        Median time of each block, as datetime objects. Entries for empty blocks
+        are meaningless.
+    """
+    if len(blocks) < 2 or len(dates) == 0:
+        return np.array([], dtype=object)
+    blocks = np.asarray(blocks, dtype=np.int64)
+    starts = np.clip(blocks[:-1], 0, len(dates) - 1)
+    ends = np.clip(blocks[1:] - 1, 0, len(dates) - 1)
+
+    # Halve the spans in microseconds, rounding half to even as timedelta does
+    spans = (dates[ends] - dates[starts]).astype(np.int64)
+    half_spans = np.rint(spans / 2.).astype(np.int64).astype('timedelta64[us]')
+    return (dates[starts] + half_spans).astype(datetime)
+
+
+def _cache_mnemonic(key, mnemonic):
+    """Store a copy of an ``EdbMnemonic`` instance in the mnemonic query cache,
+    removing the oldest entry if the cache is full.
+
+    Parameters
+    ----------
+    key : tuple
+        Mnemonic identifier, start time, and end time of the query
+
+    mnemonic : jwql.edb.engineering_database.EdbMnemonic
+        Instance to be cached
+    """
+    with _MNEMONIC_CACHE_LOCK:
+        _MNEMONIC_CACHE[key] = (time.monotonic(), copy.deepcopy(mnemonic))
+        _MNEMONIC_CACHE.move_to_end(key)
+        while len(_MNEMONIC_CACHE) > MNEMONIC_CACHE_SIZE:
+            _MNEMONIC_CACHE.popitem(last=False)
+
+
+def _date_hover_tool(renderer, label, x_name, y_name):
+    """Create a ``HoverTool`` showing the value and date of the points in
+    a plot. Bokeh models cannot be shared between documents, so a new tool
+    is created for each renderer.
+
+    Parameters
+    ----------
+    renderer : bokeh.models.GlyphRenderer
+        Renderer to which the tool applies
+
+    label : str
+        Label for the value in the tooltip, e.g. ``Mean``
+
+    x_name : str
+        Name of the ColumnDataSource column containing the dates
+
+    y_name : str
+        Name of the ColumnDataSource column containing the values
+
+    Returns
+    -------
+    hover_tool : bokeh.models.HoverTool
+        Hover tool for the renderer
+    """
+    return HoverTool(tooltips=[(label, f'@{y_name}'), ('Date', f'@{x_name}{{%d %b %Y %H:%M:%S}}')],
+                     mode='mouse', renderers=[renderer], formatters={f'@{x_name}': 'datetime'})
+
+
+@lru_cache(maxsize=1)
+def _engdb_service():
+    """Return the ``ENGDB_Service`` instance used for EDB queries. The
+    instance is created on the first call and reused afterwards.
+
+    Returns
+    -------
+    service : jwst.lib.engdb_tools.ENGDB_Service
+        Engineering database service using the configured MAST base URL
+    """
+    return ENGDB_Service(get_mast_base_url())  # By default, will use the public MAST service.
+
+
+def _full_stats_property(name):
+    """Create a property for one of the ``EdbMnemonic`` statistics attributes
+    (e.g. ``mean``). The full-data statistics are not calculated when an instance is
+    created, but rather the first time that any of the statistics attributes are
+    accessed or set, so that no time is spent on them when the caller immediately
+    calculates block, daily, or timed statistics instead.
+
+    Parameters
+    ----------
+    name : str
+        Name of the statistics attribute
+
+    Returns
+    -------
+    prop : property
+        Property that computes any pending statistics before getting or setting
+        the attribute
+    """
+    private_name = f'_{name}'
+
+    def getter(self):
+        self._compute_pending_stats()
+        return getattr(self, private_name)
+
+    def setter(self, value):
+        self._compute_pending_stats()
+        setattr(self, private_name, value)
+
+    return property(getter, setter)
+
+
+def _get_cached_mnemonic(key):
+    """Retrieve a copy of an ``EdbMnemonic`` instance from the mnemonic query cache.
+
+    Parameters
+    ----------
+    key : tuple
+        Mnemonic identifier, start time, and end time of the query
+
+    Returns
+    -------
+    mnemonic : jwql.edb.engineering_database.EdbMnemonic
+        Copy of the cached instance. None if there is no entry for ``key``, or if
+        the entry is older than ``MNEMONIC_CACHE_TTL`` seconds.
+    """
+    with _MNEMONIC_CACHE_LOCK:
+        entry = _MNEMONIC_CACHE.get(key)
+        if entry is None:
+            return None
+        timestamp, mnemonic = entry
+        if time.monotonic() - timestamp > MNEMONIC_CACHE_TTL:
+            del _MNEMONIC_CACHE[key]
+            return None
+        _MNEMONIC_CACHE.move_to_end(key)
+
+    # Return a copy, since callers are free to modify the instance (e.g. by interpolating)
+    return copy.deepcopy(mnemonic)
+
+
+def _grouped_stats(values, blocks, sigma=3):
+    """Calculate statistics for all blocks of data at once, using vectorized
+    grouped reductions. Statistics are returned only for blocks where
+    sigma-clipping would not reject any values, i.e. where the full range of
+    the values is within ``sigma`` standard deviations. For those blocks the
+    clipped and unclipped statistics are identical. Any other blocks must be
+    sigma-clipped individually.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Data values
+
+    blocks : numpy.ndarray
+        Index numbers corresponding to the beginning of each block of data,
+        with a final element marking the end of the last block
+
+    sigma : float
+        Number of sigma to use for sigma clipping
+
+    Returns
+    -------
+    stats : dict
+        Keys are the indexes of the blocks within ``blocks``. Values are tuples
+        of (mean, median, stdev, max, min) for the block.
+    """
+    blocks = np.asarray(blocks, dtype=np.int64)
+    block_nums = np.where(blocks[:-1] < blocks[1:])[0]
+    if len(block_nums) == 0:
+        return {}
+    starts = blocks[block_nums]
+    stops = blocks[block_nums + 1]
+
+    # The grouped reductions require the blocks to be contiguous and within the data
+    if np.any(stops[:-1] != starts[1:]) or stops[-1] > len(values):
+        return {}
+
+    # Work on the span of values covered by the blocks, with the beginning of each
+    # block given relative to the beginning of that span
+    vals = np.asarray(values[starts[0]:stops[-1]], dtype=np.float64)
+    offsets = starts - starts[0]
+    counts = stops - starts
+
+    means = np.add.reduceat(vals, offsets) / counts
+    resid = vals - np.repeat(means, counts)
+    stdevs = np.sqrt(np.add.reduceat(resid ** 2, offsets) / counts)
+    maxs = np.maximum.reduceat(vals, offsets)
+    mins = np.minimum.reduceat(vals, offsets)
+
+    # Find the medians by sorting the values within each block
+    group_ids = np.repeat(np.arange(len(counts)), counts)
+    sorted_vals = vals[np.lexsort((vals, group_ids))]
+    medians = (sorted_vals[offsets + (counts - 1) // 2] + sorted_vals[offsets + counts // 2]) / 2.
+
+    # If the range of the values is within sigma standard deviations, then no value
+    # can be rejected by the clipping, whatever the central value is
+    unclipped = np.nonzero((maxs - mins) <= sigma * stdevs)[0]
+
+    return {int(block_nums[j]): (means[j], medians[j], stdevs[j], maxs[j], mins[j]) for j in unclipped}
+
+
+@lru_cache(maxsize=1)
+def _mast_token():
+    """Return the MAST token, looking it up only on the first call.
+
+    Returns
+    -------
+    token : str
+        MAST token
+    """
+    return get_mast_token()
+
+
+@lru_cache(maxsize=4096)
+def _mnemonic_info(mnemonic_identifier):
+    """Query the description of a mnemonic, caching the result. This should
+    only be called through ``get_mnemonic_info``, since the returned dictionary
+    is shared by all callers.
+
+    Parameters
+    ----------
+    mnemonic_identifier : str
+        Telemetry mnemonic identifier, e.g. ``SA_ZFGOUTFOV``
+
+    Returns
+    -------
+    info : dict
+        Object that contains the returned data
+    """
+    return query_mnemonic_info(mnemonic_identifier, token=_mast_token())
+
+
+@lru_cache(maxsize=1)
+def _mnemonic_names():
+    """Return the names of all mnemonics in the mnemonic inventory as a
+    frozenset, so that membership can be checked without scanning the
+    inventory table.
+
+    Returns
+    -------
+    names : frozenset
+        Names of all mnemonics in the DMS engineering database
+    """
+    return frozenset(mnemonic_inventory()[0]['tlmMnemonic'].tolist())
+
+
+def _sigma_clipped_stats(values, sigma=3):
+    """Calculate sigma-clipped statistics on a set of values. The values are
+    first converted to a contiguous float64 ndarray, so that ``sigma_clipped_stats``
+    works on a plain array rather than an astropy Column or MaskedArray.
+
+    Parameters
+    ----------
+    values : numpy.ndarray or astropy.table.Column
+        Values on which to calculate statistics
+
+    sigma : float
+        Number of sigma to use for sigma clipping
+
+    Returns
+    -------
+    mean, median, stddev : float
+        The mean, median, and standard deviation of the sigma-clipped values
+    """
+    return sigma_clipped_stats(np.ascontiguousarray(values, dtype=np.float64), sigma=sigma,
+                               cenfunc='median', stdfunc='std', maxiters=5)
+
+
+def _sorted_unique_index(values):
+    """Find the indexes of the first occurrence of each unique value in an already
+    sorted array. Since the input is sorted, duplicates are always adjacent, and can
+    be found by comparing each element to its predecessor rather than sorting again
+    as ``numpy.unique`` would.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Sorted array
+
+    Returns
+    -------
+    index : numpy.ndarray
+        Indexes into ``values`` of the unique elements
+    """
+    values = np.asarray(values)
+    if len(values) == 0:
+        return np.array([], dtype=int)
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    keep[1:] = values[1:] != values[:-1]
+    return np.flatnonzero(keep)
+
+
+def _to_datetime64(times):
+    """Convert a collection of times into a ``numpy.datetime64`` array with
+    microsecond resolution, so that comparisons and arithmetic can be done
+    with native numpy operations rather than on individual datetime objects.
+
+    Parameters
+    ----------
+    times : list, numpy.ndarray, astropy.table.Column, or astropy.time.Time
+        Collection of times
+
+    Returns
+    -------
+    dt64 : numpy.ndarray
+        Array of ``numpy.datetime64[us]`` values
+    """
+    if isinstance(times, Time):
+        return times.datetime64.astype('datetime64[us]')
+    return np.asarray(times, dtype='datetime64[us]')
+
+
 class EdbMnemonic:
     """Class to hold and manipulate results of DMS EngDB queries."""
+    mean = _full_stats_property('mean')
+    median = _full_stats_property('median')
+    stdev = _full_stats_property('stdev')
+    median_times = _full_stats_property('median_times')
+    min = _full_stats_property('min')
+    max = _full_stats_property('max')
+
     def __add__(self, mnem):
         """Allow EdbMnemonic instances to be added (i.e. combine their data).
         info and metadata will not be touched. Data will be updated. Duplicate
@@ -109,52 +465,41 @@ class EdbMnemonic:
         if len(mnem.data["dates"]) == 0:
             return self
 
-        if np.min(self.data["dates"]) < np.min(mnem.data["dates"]):
-            early_dates = self.data["dates"].data
-            late_dates = mnem.data["dates"].data
-            early_data = self.data["euvalues"].data
-            late_data = mnem.data["euvalues"].data
+        if self.data_start_time < mnem.data_start_time:
+            early_dates = self._dates_arr
+            late_dates = mnem._dates_arr
+            early_data = self._vals_arr
+            late_data = mnem._vals_arr
             early_blocks = self.blocks
             late_blocks = mnem.blocks
         else:
-            early_dates = mnem.data["dates"].data
-            late_dates = self.data["dates"].data
-            early_data = mnem.data["euvalues"].data
-            late_data = self.data["euvalues"].data
+            early_dates = mnem._dates_arr
+            late_dates = self._dates_arr
+            early_data = mnem._vals_arr
+            late_data = self._vals_arr
             early_blocks = mnem.blocks
             late_blocks = self.blocks
 
-        # Remove any duplicates, based on the dates entries
-        # Keep track of the indexes of the removed rows, so that any blocks
-        # information can be updated
-        all_dates = np.append(early_dates, late_dates)
-        unique_dates, unq_idx = np.unique(all_dates, return_index=True)
-
-        # Combine the data and keep only unique elements
-        all_data = np.append(early_data, late_data)
-        unique_data = all_data[unq_idx]
-
-        # This assumes that if there is overlap between the two date arrays, that
-        # the overlap all occurs in a single continuous block at the beginning of
-        # the later set of dates. It will not do the right thing if you ask it to
-        # (e.g.) interleave two sets of dates.
-        overlap_len = len(unique_dates) - len(all_dates)
-
-        # Shift the block values for the later instance to account for any removed
-        # duplicate rows
-        if late_blocks[0] is not None:
-            new_late_blocks = late_blocks - overlap_len
-            if early_blocks[0] is None:
-                new_blocks = new_late_blocks
-            else:
-                new_blocks = np.append(early_blocks, new_late_blocks)
-        else:
-            if early_blocks[0] is not None:
-                new_blocks = early_blocks
-            else:
-                new_blocks = [None]
-
-        new_data = Table([unique_dates, unique_data], names=('dates', 'euvalues'))
+        # Remove any duplicates, based on the dates entries. This assumes that if
+        # there is overlap between the two date arrays, that the overlap all occurs
+        # in a single continuous block at the beginning of the later set of dates.
+        # It will not do the right thing if you ask it to (e.g.) interleave two sets
+        # of dates. Since both sets of dates are sorted, the end of the overlap can
+        # be found with a binary search rather than sorting the combined dates.
+        cut = np.searchsorted(late_dates, early_dates[-1], side='right')
+        unique_dates = np.concatenate([early_dates, late_dates[cut:]])
+        unique_data = np.concatenate([early_data, late_data[cut:]])
+
+        # Shift the block values for the later instance to their locations after
+        # the data of the earlier instance, accounting for any removed duplicate
+        # rows. Instances without blocks have empty blocks arrays, and so contribute
+        # nothing here. The shifted blocks are in order, so only repeats need to
+        # be removed.
+        late_blocks = np.clip(late_blocks - cut, 0, None) + len(early_dates)
+        new_blocks = np.concatenate([early_blocks, late_blocks])
+        new_blocks = new_blocks[_sorted_unique_index(new_blocks)]
+
+        new_data = Table({'dates': unique_dates, 'euvalues': unique_data}, copy=False)
         new_obj = EdbMnemonic(self.mnemonic_identifier, self.data_start_time, self.data_end_time,
                               new_data, self.meta, self.info, blocks=new_blocks)
 
@@ -171,7 +516,8 @@ class EdbMnemonic:
         all_median_times = np.array(list(self.median_times) + list(mnem.median_times))
         srt = np.argsort(all_median_times)
         comb_median_times = all_median_times[srt]
-        unique_median_times, idx_median_times = np.unique(comb_median_times, return_index=True)
+        idx_median_times = _sorted_unique_index(comb_median_times)
+        unique_median_times = comb_median_times[idx_median_times]
 
         new_obj.median_times = unique_median_times
         new_obj.mean = np.array(list(self.mean) + list(mnem.mean))[srt][idx_median_times]
@@ -203,7 +549,7 @@ class EdbMnemonic:
         blocks : list
             Index numbers corresponding to the beginning of separate blocks
             of data. This can be used to calculate separate statistics for
-            each block.
+            each block. The default, ``[None]``, indicates that there are no blocks.
         mean_time_block : astropy.units.quantity.Quantity
             Time period over which data are averaged
         """
@@ -213,26 +559,120 @@ class EdbMnemonic:
         self.requested_end_time = end_time
         self.data = data
 
-        self.mean = []
-        self.median = []
-        self.stdev = []
-        self.median_times = []
-        self.min = []
-        self.max = []
+        self._mean = []
+        self._median = []
+        self._stdev = []
+        self._median_times = []
+        self._min = []
+        self._max = []
         self.mean_time_block = mean_time_block
 
         self.meta = meta
         self.info = info
-        self.blocks = np.array(blocks)
+        self.blocks = blocks
 
-        if len(self.data) == 0:
-            self.data_start_time = None
-            self.data_end_time = None
-        else:
-            self.data_start_time = np.min(self.data['dates'])
-            self.data_end_time = np.max(self.data['dates'])
-            if isinstance(self.data['euvalues'][0], Number) and 'TlmMnemonics' in self.meta:
-                self.full_stats()
+        # Statistics on the full set of data are calculated the first time they are used
+        self._stats_pending = True
+
+    @property
+    def _all_points(self):
+        """bool: True for all-points data, False for change-only data"""
+        return self.meta.get('TlmMnemonics', [{}])[0].get('AllPoints', 0) != 0
+
+    @property
+    def _has_blocks(self):
+        """bool: True if the data are divided into blocks"""
+        return len(self._blocks) > 0
+
+    @property
+    def blocks(self):
+        """numpy.ndarray: Index numbers corresponding to the beginning of separate
+        blocks of data. This is empty if the data are not divided into blocks.
+        """
+        return self._blocks
+
+    @blocks.setter
+    def blocks(self, blocks):
+        """Set the block indexes as an int64 array. ``None`` or ``[None]`` indicate
+        that there are no blocks, and give an empty array.
+        """
+        if blocks is None or (len(blocks) > 0 and blocks[0] is None):
+            blocks = []
+        self._blocks = np.array(blocks, dtype=np.int64)
+
+    @property
+    def _dates_arr(self):
+        """numpy.ndarray: Plain ndarray view of the dates column. This is taken
+        from the current table on every use, so it follows any in-place changes
+        to the table.
+        """
+        return np.asarray(self._data["dates"])
+
+    @property
+    def _vals_arr(self):
+        """numpy.ndarray: Plain ndarray view of the euvalues column. This is
+        taken from the current table on every use, so it follows any in-place
+        changes to the table.
+        """
+        return np.asarray(self._data["euvalues"])
+
+    @property
+    def data_start_time(self):
+        """The date of the first data point, or None if there are no data. The
+        data are sorted in time, so there is no need to search for the extrema.
+        """
+        return self._data["dates"][0] if len(self._data) > 0 else None
+
+    @property
+    def data_end_time(self):
+        """The date of the last data point, or None if there are no data"""
+        return self._data["dates"][-1] if len(self._data) > 0 else None
+
+    @property
+    def dates_dt64(self):
+        """numpy.ndarray: The data dates as ``datetime64[us]`` values, so that date
+        comparisons and arithmetic can be done with native numpy operations. This
+        is calculated on first use, and again whenever the dates column has been
+        replaced or resized (e.g. by rows being added to or removed from the
+        table).
+        """
+        dates = self._data["dates"]
+        cached_dates, dates_dt64 = self._dates_dt64_cache
+        if cached_dates is not dates or len(dates_dt64) != len(dates):
+            dates_dt64 = _to_datetime64(dates)
+            self._dates_dt64_cache = (dates, dates_dt64)
+        return dates_dt64
+
+    @property
+    def data(self):
+        """astropy.table.Table: Table of the mnemonic dates and values"""
+        return self._data
+
+    @data.setter
+    def data(self, tab):
+        """Set the data table. Any pending full-data statistics are calculated
+        from the existing table before it is replaced.
+        """
+        if getattr(self, '_stats_pending', False):
+            self._compute_pending_stats()
+
+        self._data = tab
+        self._dates_dt64_cache = (None, None)
+
+    def __deepcopy__(self, memo):
+        """Deep copy the instance. The cached ``datetime64`` dates are not copied,
+        so that they are rebuilt from the copied table rather than referring to
+        the original one.
+        """
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        for key, value in self.__dict__.items():
+            if key == '_dates_dt64_cache':
+                value = (None, None)
+            else:
+                value = copy.deepcopy(value, memo)
+            setattr(new, key, value)
+        return new
 
     def __len__(self):
         """Report the length of the data in the instance"""
@@ -257,19 +697,28 @@ class EdbMnemonic:
         """
         # If the data has only a single entry, we won't be able to interpolate, and therefore
         # we can't multiply it. Return an empty EDBMnemonic instance
-        if len(mnem.data["dates"].data) < 2:
-            mnem.data["dates"] = []
-            mnem.data["euvalues"] = []
+        if len(mnem) < 2:
+            mnem.data = Table({"dates": [], "euvalues": []})
             return mnem
 
         # First, interpolate the data in mnem onto the same times as self.data
-        mnem.interpolate(self.data["dates"].data)
+        mnem.interpolate(self._dates_arr)
 
         # Extrapolation will not be done, so make sure that we account for any elements
         # that were removed rather than extrapolated. Find all the dates for which
         # data exists in both instances.
-        common_dates, self_idx, mnem_idx = np.intersect1d(self.data["dates"], mnem.data["dates"],
-                                                          return_indices=True)
+        # Both sets of dates are sorted and unique, so the common dates can be found by
+        # searching for each of our dates in mnem's dates, rather than via a sort-based
+        # intersection.
+        self_dates = self.dates_dt64
+        mnem_dates = mnem.dates_dt64
+        pos = np.searchsorted(mnem_dates, self_dates)
+        in_range = pos < len(mnem_dates)
+        found = np.zeros(len(self_dates), dtype=bool)
+        found[in_range] = mnem_dates[pos[in_range]] == self_dates[in_range]
+        self_idx = np.nonzero(found)[0]
+        mnem_idx = pos[found]
+        common_dates = self._dates_arr[self_idx]
 
         # Adjust self.blocks based on the new dates. For each block, find the index of common_dates
         # that corresponds to its previous date, and use that index in the new blocks list. Note that
@@ -300,9 +749,8 @@ class EdbMnemonic:
         mnem_data = mnem.data[mnem_idx]
 
         # Mulitply
-        new_tab = Table()
-        new_tab["dates"] = common_dates
-        new_tab["euvalues"] = self_data["euvalues"] * mnem_data["euvalues"]
+        new_tab = Table({"dates": common_dates, "euvalues": self_data["euvalues"].data * mnem_data["euvalues"].data},
+                        copy=False)
 
         new_obj = EdbMnemonic(self.mnemonic_identifier, self.requested_start_time, self.requested_end_time,
                               new_tab, self.meta, self.info, blocks=new_blocks)
@@ -328,6 +776,94 @@ class EdbMnemonic:
             self.mnemonic_identifier, len(self.data), self.data_start_time,
             self.data_end_time)
 
+    def _base_figure(self, title=None, x_axis_type='datetime', xrange=(None, None), yrange=(None, None),
+                     yellow_limits=None, red_limits=None):
+        """Create the bokeh figure used by the plotting methods, with the title, axis
+        labels and axis ranges set. This depends only on the plot configuration and
+        not on the data values, which are added to the figure by the caller.
+
+        Parameters
+        ----------
+        title : str
+            Will be used as the plot title. If None, the mnemonic name and description (if present)
+            will be used as the title
+
+        x_axis_type : str
+            Type of x axis to use. Passed directly to ``bokeh.plotting.figure``
+
+        xrange : tuple
+            Tuple of min, max datetime values to use as the plot range in the x direction.
+
+        yrange : tuple
+            Tuple of min, max values to use as the plot range in the y direction.
+
+        yellow_limits : list
+            2-element list giving the lower and upper yellow limits. Used to set the y range
+            of plots with fewer than 2 data points.
+
+        red_limits : list
+            2-element list giving the lower and upper red limits. Used to set the y range
+            of plots with fewer than 2 data points.
+
+        Returns
+        -------
+        fig : bokeh.plotting.figure
+            Empty figure
+
+        units : str
+            Units of the mnemonic values
+        """
+        if self.info is None:
+            units = 'Unknown'
+        else:
+            units = self.info["unit"]
+
+        # Create a useful plot title if necessary
+        if title is None:
+            if 'description' in self.info:
+                if len(self.info['description']) > 0:
+                    title = f'{self.mnemonic_identifier} - {self.info["description"]}'
+                else:
+                    title = self.mnemonic_identifier
+            else:
+                title = self.mnemonic_identifier
+
+        fig = figure(tools='pan,box_zoom,reset,wheel_zoom,save', x_axis_type=x_axis_type,
+                     title=title, x_axis_label='Time', y_axis_label=f'{units}')
+
+        # For cases where the plot is empty or contains only a single point, force the
+        # plot range to something reasonable
+        if len(self.data["dates"]) < 2:
+            fig.x_range = Range1d(self.requested_start_time - timedelta(days=1), self.requested_end_time)
+            bottom, top = (-1, 1)
+            if yellow_limits is not None:
+                bottom, top = yellow_limits
+            if red_limits is not None:
+                bottom, top = red_limits
+            fig.y_range = Range1d(bottom, top)
+
+        # Force the axes' range if requested
+        if xrange[0] is not None:
+            fig.x_range.start = xrange[0].timestamp() * 1000.
+        if xrange[1] is not None:
+            fig.x_range.end = xrange[1].timestamp() * 1000.
+        if yrange[0] is not None:
+            fig.y_range.start = yrange[0]
+        if yrange[1] is not None:
+            fig.y_range.end = yrange[1]
+
+        return fig, units
+
+    def _compute_pending_stats(self):
+        """Calculate the statistics on the full set of data, if this has not yet been
+        done and the statistics have not been replaced by e.g. ``block_stats``.
+        """
+        if self._stats_pending:
+            self._stats_pending = False
+            if len(self.data) > 0:
+                if isinstance(self.data['euvalues'][0], Number) and 'TlmMnemonics' in self.meta:
+                    self.full_stats()
+
     def block_stats(self, sigma=3, ignore_vals=[], ignore_edges=False, every_change=False):
         """Calculate stats for a mnemonic where we want a mean value for
         each block of good data, where blocks are separated by times where
@@ -352,6 +888,7 @@ class EdbMnemonic:
             If True, the data are assumed to be every_change data. This is used when dealing with
             blocks that exclusively contain data to be ignored
         """
+        self._stats_pending = False
         means = []
         medians = []
         maxs = []
@@ -359,12 +896,25 @@ class EdbMnemonic:
         stdevs = []
         medtimes = []
         remove_change_indexes = []
-        if type(self.data["euvalues"].data[0]) not in [np.str_, str]:
+        values = self._vals_arr
+        block_medtimes = _block_median_times(self.dates_dt64, self.blocks)
+        if type(values[0]) not in [np.str_, str]:
+            all_points = self._all_points
+
+            # If no values are being ignored, calculate the statistics for all blocks at
+            # once. Only blocks containing values that may be clipped then need to be
+            # sigma-clipped individually below.
+            grouped = {}
+            if all_points and len(ignore_vals) == 0 and not ignore_edges:
+                grouped = _grouped_stats(values, self.blocks, sigma=sigma)
+
             for i, index in enumerate(self.blocks[0:-1]):
                 # Protect against repeated block indexes
                 if index < self.blocks[i + 1]:
-                    if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
-                        block = self.data["euvalues"].data[index:self.blocks[i + 1]]
+                    if i in grouped:
+                        meanval, medianval, stdevval, maxval, minval = grouped[i]
+                    elif all_points:
+                        block = values[index:self.blocks[i + 1]]
 
                         empty_block = False
                         uvals = np.unique(block)
@@ -400,15 +950,15 @@ class EdbMnemonic:
                                     if not ignore_first:
                                         block = block[2:]
 
-                            meanval, medianval, stdevval = sigma_clipped_stats(block, sigma=sigma)
+                            meanval, medianval, stdevval = _sigma_clipped_stats(block, sigma=sigma)
                             maxval = np.max(block)
                             minval = np.min(block)
                     else:
-                        meanval, medianval, stdevval, maxval, minval = change_only_stats(self.data["dates"].data[index:self.blocks[i + 1]],
-                                                                                         self.data["euvalues"].data[index:self.blocks[i + 1]],
+                        meanval, medianval, stdevval, maxval, minval = change_only_stats(self.dates_dt64[index:self.blocks[i + 1]],
+                                                                                         values[index:self.blocks[i + 1]],
                                                                                          sigma=sigma)
                     if np.isfinite(meanval):
-                        medtimes.append(calc_median_time(self.data["dates"].data[index:self.blocks[i + 1]]))
+                        medtimes.append(block_medtimes[i])
                         means.append(meanval)
                         medians.append(medianval)
                         maxs.append(maxval)
@@ -430,10 +980,10 @@ class EdbMnemonic:
             for i, index in enumerate(self.blocks[0:-1]):
                 # Protect against repeated block indexes
                 if index < self.blocks[i + 1]:
-                    meanval = self.data["euvalues"].data[index]
+                    meanval = values[index]
                     medianval = meanval
                     stdevval = 0
-                    medtimes.append(calc_median_time(self.data["dates"].data[index:self.blocks[i + 1]]))
+                    medtimes.append(block_medtimes[i])
                     means.append(meanval)
                     medians.append(medianval)
                     stdevs.append(stdevval)
@@ -460,6 +1010,7 @@ class EdbMnemonic:
         sigma : int
             Number of sigma to use for sigma clipping
         """
+        self._stats_pending = False
         means = []
         medians = []
         maxs = []
@@ -468,10 +1019,11 @@ class EdbMnemonic:
         medtimes = []
         remove_change_indexes = []
         if type(self.data["euvalues"].data[0]) not in [np.str_, str]:
+            all_points = self._all_points
             for i, index in enumerate(self.blocks[0:-1]):
                 # Protect against repeated block indexes
                 if index < self.blocks[i + 1]:
-                    if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
+                    if all_points:
                         block = self.data["euvalues"].data[index:self.blocks[i + 1]]
                         filter_value = self.every_change_values[i]
                         pos_type = self.mnemonic_identifier.split('_')[2]
@@ -501,12 +1053,12 @@ class EdbMnemonic:
                             # If there are values to be ignored, remove those from the array
                             # of elements. Keep track of whether the first and last are ignored.
                             block = block[good]
-                            meanval, medianval, stdevval = sigma_clipped_stats(block, sigma=sigma)
+                            meanval, medianval, stdevval = _sigma_clipped_stats(block, sigma=sigma)
                             maxval = np.max(block)
                             minval = np.min(block)
 
                     else:
-                        meanval, medianval, stdevval, maxval, minval = change_only_stats(self.data["dates"].data[index:self.blocks[i + 1]],
+                        meanval, medianval, stdevval, maxval, minval = change_only_stats(self.dates_dt64[index:self.blocks[i + 1]],
                                                                                          self.data["euvalues"].data[index:self.blocks[i + 1]],
                                                                                          sigma=sigma)
                     if np.isfinite(meanval):
@@ -620,10 +1172,11 @@ class EdbMnemonic:
             If return_figre is True, return the bokeh figure itself
         """
         # Make sure that only one output type is specified, or bokeh will get mad
-        options = np.array([show_plot, savefig, return_components, return_fig])
-        if np.sum(options) > 1:
-            trues = np.where(options)[0]
-            raise ValueError((f'{options[trues]} are set to True in plot_every_change_data. Bokeh '
+        options = {'show_plot': show_plot, 'savefig': savefig, 'return_components': return_components,
+                   'return_fig': return_fig}
+        if sum(bool(option) for option in options.values()) > 1:
+            trues = [name for name, option in options.items() if option]
+            raise ValueError((f'{trues} are set to True in plot_every_change_data. Bokeh '
                               'will only allow one of these to be True.'))
 
         # yellow and red limits must come in pairs
@@ -634,55 +1187,30 @@ class EdbMnemonic:
             if len(red_limits) != 2:
                 red_limits = None
 
+        num_points = len(self)
+
         # If there are no data in the table, then produce an empty plot in the date
         # range specified by the requested start and end time
-        if len(self.data["dates"]) == 0:
+        if num_points == 0:
             null_dates = [self.requested_start_time, self.requested_end_time]
             null_vals = [0, 0]
             source = ColumnDataSource(data={'x': null_dates, 'y': null_vals})
         else:
-            source = ColumnDataSource(data={'x': self.data['dates'], 'y': self.data['euvalues']})
+            # Give bokeh the dates as float milliseconds since the epoch, which it can send to
+            # the browser as a binary array rather than converting each datetime individually
+            source = ColumnDataSource(data={'x': self.dates_dt64.astype('datetime64[ms]').astype(np.float64),
+                                            'y': self._vals_arr})
 
         if savefig:
             filename = os.path.join(out_dir, f"telem_plot_{self.mnemonic_identifier.replace(' ','_')}.html")
 
-        if self.info is None:
-            units = 'Unknown'
-        else:
-            units = self.info["unit"]
-
-        # Create a useful plot title if necessary
-        if title is None:
-            if 'description' in self.info:
-                if len(self.info['description']) > 0:
-                    title = f'{self.mnemonic_identifier} - {self.info["description"]}'
-                else:
-                    title = self.mnemonic_identifier
-            else:
-                title = self.mnemonic_identifier
-
-        fig = figure(tools='pan,box_zoom,reset,wheel_zoom,save', x_axis_type='datetime',
-                     title=title, x_axis_label='Time', y_axis_label=f'{units}')
-
-        # For cases where the plot is empty or contains only a single point, force the
-        # plot range to something reasonable
-        if len(self.data["dates"]) < 2:
-            fig.x_range = Range1d(self.requested_start_time - timedelta(days=1), self.requested_end_time)
-            bottom, top = (-1, 1)
-            if yellow_limits is not None:
-                bottom, top = yellow_limits
-            if red_limits is not None:
-                bottom, top = red_limits
-            fig.y_range = Range1d(bottom, top)
+        fig, units = self._base_figure(title=title, x_axis_type='datetime', xrange=xrange, yrange=yrange,
+                                       yellow_limits=yellow_limits, red_limits=red_limits)
 
         if plot_data:
             data = fig.scatter(x='x', y='y', line_width=1, line_color='blue', source=source)
             data_line = fig.line(x='x', y='y', line_width=1, line_color='blue', source=source)
-            hover_tool = HoverTool(tooltips=[('Value', '@y'),
-                                             ('Date', '@x{%d %b %Y %H:%M:%S}')
-                                             ], mode='mouse', renderers=[data])
-            hover_tool.formatters = {'@x': 'datetime'}
-            fig.tools.append(hover_tool)
+            fig.tools.append(_date_hover_tool(data, 'Value', 'x', 'y'))
 
         # Plot the mean value over time
         if len(self.median_times) > 0:
@@ -690,74 +1218,39 @@ class EdbMnemonic:
                 if plot_mean:
                     source_mean = ColumnDataSource(data={'mean_x': self.median_times, 'mean_y': self.mean})
                     mean_data = fig.scatter(x='mean_x', y='mean_y', line_width=1, line_color='orange', alpha=0.75, source=source_mean)
-                    mean_hover_tool = HoverTool(tooltips=[('Mean', '@mean_y'),
-                                                          ('Date', '@mean_x{%d %b %Y %H:%M:%S}')
-                                                         ], mode='mouse', renderers=[mean_data])
-                    mean_hover_tool.formatters = {'@mean_x': 'datetime'}
-                    fig.tools.append(mean_hover_tool)
+                    fig.tools.append(_date_hover_tool(mean_data, 'Mean', 'mean_x', 'mean_y'))
 
                 if plot_median:
                     source_median = ColumnDataSource(data={'median_x': self.median_times, 'median_y': self.median})
                     median_data = fig.scatter(x='median_x', y='median_y', line_width=1, line_color='orangered', alpha=0.75, source=source_median)
-                    median_hover_tool = HoverTool(tooltips=[('Median', '@median_y'),
-                                                            ('Date', '@median_x{%d %b %Y %H:%M:%S}')
-                                                           ], mode='mouse', renderers=[median_data])
-                    median_hover_tool.formatters = {'@median_x': 'datetime'}
-                    fig.tools.append(median_hover_tool)
+                    fig.tools.append(_date_hover_tool(median_data, 'Median', 'median_x', 'median_y'))
 
                  # If the max and min arrays are to be plotted, create columndata sources for them as well
                 if plot_max:
                     source_max = ColumnDataSource(data={'max_x': self.median_times, 'max_y': self.max})
                     max_data = fig.scatter(x='max_x', y='max_y', line_width=1, color='black', line_color='black', source=source_max)
-                    max_hover_tool = HoverTool(tooltips=[('Max', '@max_y'),
-                                                         ('Date', '@max_x{%d %b %Y %H:%M:%S}')
-                                                        ], mode='mouse', renderers=[max_data])
-                    max_hover_tool.formatters = {'@max_x': 'datetime'}
-                    fig.tools.append(max_hover_tool)
+                    fig.tools.append(_date_hover_tool(max_data, 'Max', 'max_x', 'max_y'))
 
                 if plot_min:
                     source_min = ColumnDataSource(data={'min_x': self.median_times, 'min_y': self.min})
                     min_data = fig.scatter(x='min_x', y='min_y', line_width=1, color='black', line_color='black', source=source_min)
-                    minn_hover_tool = HoverTool(tooltips=[('Min', '@min_y'),
-                                                          ('Date', '@min_x{%d %b %Y %H:%M:%S}')
-                                                         ], mode='mouse', renderers=[min_data])
-                    min_hover_tool.formatters = {'@min_x': 'datetime'}
-                    fig.tools.append(min_hover_tool)
+                    fig.tools.append(_date_hover_tool(min_data, 'Min', 'min_x', 'min_y'))
 
-        if len(self.data["dates"]) == 0:
+        if num_points == 0:
             data.visible = False
-            if nominal_value is not None:
-                fig.line(null_dates, np.repeat(nominal_value, len(null_dates)), color='black',
-                         line_dash='dashed', alpha=0.5)
-        else:
-            # If there is a nominal value provided, plot a dashed line for it
-            if nominal_value is not None:
-                fig.line(self.data['dates'], np.repeat(nominal_value, len(self.data['dates'])), color='black',
-                         line_dash='dashed', alpha=0.5)
+
+        # If there is a nominal value provided, plot a dashed line for it
+        if nominal_value is not None:
+            fig.add_layout(Span(location=nominal_value, dimension='width', line_color='black',
+                                line_dash='dashed', line_alpha=0.5))
 
         # If limits for warnings/errors are provided, create colored background boxes
         if yellow_limits is not None or red_limits is not None:
             fig = add_limit_boxes(fig, yellow=yellow_limits, red=red_limits)
 
         # Make the x axis tick labels look nice
-        fig.xaxis.formatter = DatetimeTickFormatter(microseconds=["%d %b %H:%M:%S.%3N"],
-                                                    seconds=["%d %b %H:%M:%S.%3N"],
-                                                    hours=["%d %b %H:%M"],
-                                                    days=["%d %b %H:%M"],
-                                                    months=["%d %b %Y %H:%M"],
-                                                    years=["%d %b %Y"]
-                                                    )
-        fig.xaxis.major_label_orientation = np.pi / 4
-
-        # Force the axes' range if requested
-        if xrange[0] is not None:
-            fig.x_range.start = xrange[0].timestamp() * 1000.
-        if xrange[1] is not None:
-            fig.x_range.end = xrange[1].timestamp() * 1000.
-        if yrange[0] is not None:
-            fig.y_range.start = yrange[0]
-        if yrange[1] is not None:
-            fig.y_range.end = yrange[1]
+        fig.xaxis.formatter = DatetimeTickFormatter(**DATE_TICK_FORMATS)
+        fig.xaxis.major_label_orientation = DATE_LABEL_ORIENTATION
 
         if savefig:
             output_file(filename=filename, title=self.mnemonic_identifier)
@@ -821,22 +1314,109 @@ class EdbMnemonic:
         This will help with filtering data based on conditions later, and will create a
         plot that looks more realistic, with only horizontal and vertical lines.
         """
-        new_dates = [self.data["dates"][0]]
-        new_vals = [self.data["euvalues"][0]]
+        dates = self._dates_arr
+        vals = self._vals_arr
+        num_points = len(dates)
         delta_t = timedelta(microseconds=1)
-        for i, row in enumerate(self.data["dates"][1:]):
-            new_dates.append(self.data["dates"][i + 1] - delta_t)
-            new_vals.append(self.data["euvalues"][i])
-            new_dates.append(self.data["dates"][i + 1])
-            new_vals.append(self.data["euvalues"][i + 1])
-        new_table = Table()
-        new_table["dates"] = new_dates
-        new_table["euvalues"] = new_vals
-        self.data = new_table
+
+        # Interleave the original points with the added points, which are placed
+        # just before each original point and carry the value of the point before
+        new_dates = np.empty(2 * num_points - 1, dtype=dates.dtype)
+        new_vals = np.empty(2 * num_points - 1, dtype=vals.dtype)
+        new_dates[0::2] = dates
+        new_dates[1::2] = dates[1:] - delta_t
+        new_vals[0::2] = vals
+        new_vals[1::2] = vals[:-1]
+        self.data = Table({"dates": new_dates, "euvalues": new_vals}, copy=False)
 
         # Update the metadata to say that this is no longer change-only data
         self.meta['TlmMnemonics'][0]['AllPoints'] = 1
 
+    @classmethod
+    def concat(cls, instances):
+        """Combine a list of EdbMnemonic instances into a single instance. This gives the
+        same data as adding the instances together (e.g. ``a + b + c``), but the combined
+        arrays are allocated only once, rather than once per addition. As with addition,
+        the instances are ordered by their starting dates, and any overlap is assumed to
+        be limited to a single section at the end of one instance and the beginning of
+        the next. Duplicate rows from the overlap are removed, and blocks are shifted to
+        their locations within the combined data.
+
+        Parameters
+        ----------
+        instances : list
+            List of jwql.edb.engineering_database.EdbMnemonic instances to combine
+
+        Returns
+        -------
+        new_obj : jwql.edb.engineering_database.EdbMnemonic
+            Combined instance
+        """
+        identifiers = set([mnem.mnemonic_identifier for mnem in instances])
+        if len(identifiers) > 1:
+            raise ValueError(f'Unable to concatenate EdbMnemonic instances for {identifiers}.')
+
+        # Instances with empty data tables do not contribute anything
+        nonempty = [mnem for mnem in instances if len(mnem) > 0]
+        if len(nonempty) == 0:
+            return instances[0]
+        if len(nonempty) == 1:
+            return nonempty[0]
+        instances = sorted(nonempty, key=lambda mnem: mnem.data_start_time)
+        first = instances[0]
+
+        total = sum([len(mnem) for mnem in instances])
+        dates = np.empty(total, dtype=np.result_type(*[mnem._dates_arr for mnem in instances]))
+        values = np.empty(total, dtype=np.result_type(*[mnem._vals_arr for mnem in instances]))
+
+        # Copy the data from each instance into place, skipping any rows that overlap
+        # with the data already copied
+        offset = 0
+        last_date = None
+        blocks = []
+        for mnem in instances:
+            cut = 0
+            if last_date is not None:
+                cut = np.searchsorted(mnem.dates_dt64, last_date, side='right')
+            num = len(mnem) - cut
+            dates[offset:offset + num] = mnem._dates_arr[cut:]
+            values[offset:offset + num] = mnem._vals_arr[cut:]
+            if mnem._has_blocks:
+                blocks.append(np.clip(mnem.blocks - cut, 0, None) + offset)
+            offset += num
+            if num > 0:
+                last_date = mnem.dates_dt64[-1]
+
+        # The shifted blocks are already in order, so only repeats need to be removed
+        new_blocks = np.concatenate([np.empty(0, dtype=np.int64)] + blocks)
+        new_blocks = new_blocks[_sorted_unique_index(new_blocks)]
+
+        new_data = Table({'dates': dates[0:offset], 'euvalues': values[0:offset]}, copy=False)
+        new_obj = cls(first.mnemonic_identifier, first.data_start_time, instances[-1].data_end_time,
+                      new_data, first.meta, first.info, blocks=new_blocks)
+
+        new_obj.mean_time_block = None
+        for mnem in instances:
+            if mnem.mean_time_block is not None:
+                new_obj.mean_time_block = mnem.mean_time_block
+                break
+
+        # Combine any existing mean, median, min, max data, removing overlaps
+        # All of these are populated in concert with median_times, so we can
+        # use that to look for overlap values
+        all_median_times = np.array([val for mnem in instances for val in mnem.median_times])
+        srt = np.argsort(all_median_times)
+        idx_median_times = _sorted_unique_index(all_median_times[srt])
+        unique_median_times = all_median_times[srt][idx_median_times]
+
+        new_obj.median_times = unique_median_times
+        new_obj.mean = np.array([val for mnem in instances for val in mnem.mean])[srt][idx_median_times]
+        new_obj.median = np.array([val for mnem in instances for val in mnem.median])[srt][idx_median_times]
+        new_obj.max = np.array([val for mnem in instances for val in mnem.max])[srt][idx_median_times]
+        new_obj.min = np.array([val for mnem in instances for val in mnem.min])[srt][idx_median_times]
+
+        return new_obj
+
     def daily_stats(self, sigma=3):
         """Calculate the statistics for each day in the data
         contained in data["data"]. Should we add a check for a
@@ -847,6 +1427,7 @@ class EdbMnemonic:
         sigma : int
             Number of sigma to use for sigma clipping
         """
+        self._stats_pending = False
         if len(self.data["euvalues"]) == 0:
             self.mean = []
             self.median = []
@@ -866,16 +1447,22 @@ class EdbMnemonic:
                 limits = np.array([min_date + timedelta(days=x) for x in range(range_days)])
                 limits = np.append(limits, np.max(self.data["dates"]))
 
+                # The dates are sorted, so the indexes bounding each day can be found
+                # with a single search rather than a separate scan for each day
+                edges = np.searchsorted(self.dates_dt64, _to_datetime64(limits))
+
+                all_points = self._all_points
                 means, meds, devs, maxs, mins, times = [], [], [], [], [], []
                 for i in range(len(limits) - 1):
-                    good = np.where((self.data["dates"] >= limits[i]) & (self.data["dates"] < limits[i + 1]))
+                    good = slice(edges[i], edges[i + 1])
 
-                    if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
-                        avg, med, dev = sigma_clipped_stats(self.data["euvalues"][good], sigma=sigma)
-                        maxval = np.max(self.data["euvalues"][good])
-                        minval = np.min(self.data["euvalues"][good])
+                    if all_points:
+                        avg, med, dev = _sigma_clipped_stats(self._vals_arr[good], sigma=sigma)
+                        maxval = np.max(self._vals_arr[good])
+                        minval = np.min(self._vals_arr[good])
                     else:
-                        avg, med, dev, maxval, minval = change_only_stats(self.data["dates"][good], self.data["euvalues"][good], sigma=sigma)
+                        avg, med, dev, maxval, minval = change_only_stats(self.dates_dt64[good],
+                                                                          self._vals_arr[good], sigma=sigma)
                     means.append(avg)
                     meds.append(med)
                     maxs.append(maxval)
@@ -905,13 +1492,14 @@ class EdbMnemonic:
         sigma : int
             Number of sigma to use for sigma clipping
         """
+        self._stats_pending = False
         if type(self.data["euvalues"].data[0]) not in [np.str_, str]:
-            if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
-                self.mean, self.median, self.stdev = sigma_clipped_stats(self.data["euvalues"], sigma=sigma)
+            if self._all_points:
+                self.mean, self.median, self.stdev = _sigma_clipped_stats(self.data["euvalues"], sigma=sigma)
                 self.max = np.max(self.data["euvalues"])
                 self.min = np.min(self.data["euvalues"])
             else:
-                self.mean, self.median, self.stdev, self.max, self.min = change_only_stats(self.data["dates"], self.data["euvalues"], sigma=sigma)
+                self.mean, self.median, self.stdev, self.max, self.min = change_only_stats(self.dates_dt64, self._vals_arr, sigma=sigma)
             self.mean = [self.mean]
             self.median = [self.median]
             self.stdev = [self.stdev]
@@ -952,45 +1540,46 @@ class EdbMnemonic:
         times : list
             List of datetime objects describing the times to interpolate to
         """
-        new_tab = Table()
+        mnem_dates = self.dates_dt64
+        interp_dates = _to_datetime64(times)
 
         # Change-only data is unique and needs its own way to be interpolated
-        if self.meta['TlmMnemonics'][0]['AllPoints'] == 0:
-            new_values = []
-            new_dates = []
-            for time in times:
-                latest = np.where(self.data["dates"] <= time)[0]
-                if len(latest) > 0:
-                    new_values.append(self.data["euvalues"][latest[-1]])
-                    new_dates.append(time)
-            if len(new_values) > 0:
-                new_tab["euvalues"] = np.array(new_values)
-                new_tab["dates"] = np.array(new_dates)
+        if not self._all_points:
+            # Find the latest data point at or before each of the requested times. Times
+            # prior to the first data point have no value and are ignored.
+            latest = np.searchsorted(mnem_dates, interp_dates, side='right') - 1
+            good_times = latest >= 0
+            new_values = self._vals_arr[latest[good_times]]
+            new_dates = interp_dates[good_times].astype(datetime)
 
         # This is for non change-only data
         else:
             # We can only linearly interpolate if we have more than one entry
             if len(self.data["dates"]) >= 2:
-                interp_times = np.array([create_time_offset(ele, self.data["dates"][0]) for ele in times])
-                mnem_times = np.array([create_time_offset(ele, self.data["dates"][0]) for ele in self.data["dates"]])
+                # Work with integer microsecond offsets from the first data point
+                epoch = mnem_dates[0]
+                interp_times = (interp_dates - epoch).astype(np.int64)
+                mnem_times = (mnem_dates - epoch).astype(np.int64)
 
                 # Do not extrapolate. Any requested interoplation times that are outside the range
                 # or the original data will be ignored.
                 good_times = ((interp_times >= mnem_times[0]) & (interp_times <= mnem_times[-1]))
                 interp_times = interp_times[good_times]
 
-                new_tab["euvalues"] = np.interp(interp_times, mnem_times, self.data["euvalues"])
-                new_tab["dates"] = np.array([add_time_offset(ele, self.data["dates"][0]) for ele in interp_times])
+                new_values = np.interp(interp_times, mnem_times, self._vals_arr)
+                new_dates = (epoch + interp_times.astype('timedelta64[us]')).astype(datetime)
 
             else:
                 # If there are not enough data and we are unable to interpolate,
                 # then set the data table to be empty
-                new_tab["euvalues"] = np.array([])
-                new_tab["dates"] = np.array([])
+                new_values = np.array([])
+                new_dates = np.array([])
+
+        new_tab = Table({"dates": new_dates, "euvalues": new_values}, copy=False)
 
         # Adjust any block values to account for the interpolated data
         new_blocks = []
-        if self.blocks is not None:
+        if self._has_blocks:
             for index in self.blocks[0:-1]:
                 good = np.where(new_tab["dates"] >= self.data["dates"][index])[0]
 
@@ -1073,23 +1662,30 @@ class EdbMnemonic:
             If return_figre is True, return the bokeh figure itself
         """
         # Make sure that only one output type is specified, or bokeh will get mad
-        options = np.array([show_plot, savefig, return_components, return_fig])
-        if np.sum(options) > 1:
-            trues = np.where(options)[0]
-            raise ValueError((f'{options[trues]} are set to True in plot_every_change_data. Bokeh '
+        options = {'show_plot': show_plot, 'savefig': savefig, 'return_components': return_components,
+                   'return_fig': return_fig}
+        if sum(bool(option) for option in options.values()) > 1:
+            trues = [name for name, option in options.items() if option]
+            raise ValueError((f'{trues} are set to True in plot_every_change_data. Bokeh '
                               'will only allow one of these to be True.'))
 
+        num_points = len(self)
+
         # If there are no data in the table, then produce an empty plot in the date
         # range specified by the requested start and end time
-        if len(self.data["dates"]) == 0:
+        if num_points == 0:
             null_dates = [self.requested_start_time, self.requested_end_time]
             null_vals = [0, 0]
-            data_dates = null_dates
+            data_dates = _to_datetime64(Time(null_dates))
             data_vals = null_vals
+            plot_dates = null_dates
         else:
-            data_dates = self.data['dates']
-            data_vals = self.data['euvalues']
-        source = ColumnDataSource(data={'x': data_dates, 'y': data_vals})
+            data_dates = self.dates_dt64
+            data_vals = self._vals_arr
+            # Give bokeh the dates as float milliseconds since the epoch, which it can send to
+            # the browser as a binary array rather than converting each datetime individually
+            plot_dates = self.dates_dt64.astype('datetime64[ms]').astype(np.float64)
+        source = ColumnDataSource(data={'x': plot_dates, 'y': data_vals})
 
         # yellow and red limits must come in pairs
         if yellow_limits is not None:
@@ -1102,35 +1698,8 @@ class EdbMnemonic:
         if savefig:
             filename = os.path.join(out_dir, f"telem_plot_{self.mnemonic_identifier.replace(' ','_')}.html")
 
-        if self.info is None:
-            units = 'Unknown'
-        else:
-            units = self.info["unit"]
-
-        # Create a useful plot title if necessary
-        if title is None:
-            if 'description' in self.info:
-                if len(self.info['description']) > 0:
-                    title = f'{self.mnemonic_identifier} - {self.info["description"]}'
-                else:
-                    title = self.mnemonic_identifier
-            else:
-                title = self.mnemonic_identifier
-
-        fig = figure(tools='pan,box_zoom,reset,wheel_zoom,save', x_axis_type=None,
-                     title=title, x_axis_label='Time',
-                     y_axis_label=f'{units}')
-
-        # For cases where the plot is empty or contains only a single point, force the
-        # plot range to something reasonable
-        if len(self.data["dates"]) < 2:
-            fig.x_range = Range1d(self.requested_start_time - timedelta(days=1), self.requested_end_time)
-            bottom, top = (-1, 1)
-            if yellow_limits is not None:
-                bottom, top = yellow_limits
-            if red_limits is not None:
-                bottom, top = red_limits
-            fig.y_range = Range1d(bottom, top)
+        fig, units = self._base_figure(title=title, x_axis_type=None, xrange=xrange, yrange=yrange,
+                                       yellow_limits=yellow_limits, red_limits=red_limits)
 
         data = fig.scatter(x='x', y='y', line_width=1, line_color='blue', source=source)
 
@@ -1153,37 +1722,19 @@ class EdbMnemonic:
                     source_min = ColumnDataSource(data={'min_x': self.median_times, 'min_y': self.min})
                     fig.scatter(x='min_x', y='min_y', line_width=1, line_color='black', source=source_min)
 
-        if len(self.data["dates"]) == 0:
+        if num_points == 0:
             data.visible = False
-            if nominal_value is not None:
-                fig.line(null_dates, np.repeat(nominal_value, len(null_dates)), color='black',
-                         line_dash='dashed', alpha=0.5)
-        else:
-            # If there is a nominal value provided, plot a dashed line for it
-            if nominal_value is not None:
-                fig.line(self.data['dates'], np.repeat(nominal_value, len(self.data['dates'])), color='black',
-                         line_dash='dashed', alpha=0.5)
+
+        # If there is a nominal value provided, plot a dashed line for it
+        if nominal_value is not None:
+            fig.add_layout(Span(location=nominal_value, dimension='width', line_color='black',
+                                line_dash='dashed', line_alpha=0.5))
 
         # If limits for warnings/errors are provided, create colored background boxes
         if yellow_limits is not None or red_limits is not None:
             fig = add_limit_boxes(fig, yellow=yellow_limits, red=red_limits)
 
-        hover_tool = HoverTool(tooltips=[('Value', '@y'),
-                                         ('Date', '@x{%d %b %Y %H:%M:%S}')
-                                         ], mode='mouse', renderers=[data])
-        hover_tool.formatters = {'@x': 'datetime'}
-
-        fig.tools.append(hover_tool)
-
-        # Force the axes' range if requested
-        if xrange[0] is not None:
-            fig.x_range.start = xrange[0].timestamp() * 1000.
-        if xrange[1] is not None:
-            fig.x_range.end = xrange[1].timestamp() * 1000.
-        if yrange[0] is not None:
-            fig.y_range.start = yrange[0]
-        if yrange[1] is not None:
-            fig.y_range.end = yrange[1]
+        fig.tools.append(_date_hover_tool(data, 'Value', 'x', 'y'))
 
         # Now create a second plot showing the devitation from the mean
         fig_dev = figure(height=250, x_range=fig.x_range, tools="xpan,xwheel_zoom,xbox_zoom,reset", y_axis_location="left",
@@ -1203,17 +1754,11 @@ class EdbMnemonic:
             dev = [0] * len(data_vals)
 
         # Plot
-        fig_dev.line(data_dates, dev, color='red')
+        fig_dev.line(plot_dates, dev, color='red')
 
         # Make the x axis tick labels look nice
-        fig_dev.xaxis.formatter = DatetimeTickFormatter(microseconds=["%d %b %H:%M:%S.%3N"],
-                                                        seconds=["%d %b %H:%M:%S.%3N"],
-                                                        hours=["%d %b %H:%M"],
-                                                        days=["%d %b %H:%M"],
-                                                        months=["%d %b %Y %H:%M"],
-                                                        years=["%d %b %Y"]
-                                                        )
-        fig.xaxis.major_label_orientation = np.pi / 4
+        fig_dev.xaxis.formatter = DatetimeTickFormatter(**DATE_TICK_FORMATS)
+        fig.xaxis.major_label_orientation = DATE_LABEL_ORIENTATION
 
         # Place the two figures in a column object
         bothfigs = column(fig, fig_dev)
@@ -1231,14 +1776,18 @@ class EdbMnemonic:
             return bothfigs
 
     def save_table(self, outname):
-        """Save the EdbMnemonic instance
+        """Save the EdbMnemonic instance. Dates are written as ISO strings
+        (e.g. ``2022-03-02T12:00:00.000000``), converted all at once so that
+        the table can be written with astropy's fast ascii writer.
 
         Parameters
         ----------
         outname : str
             Name of text file to save information into
         """
-        ascii.write(self.data, outname, overwrite=True)
+        out_tab = Table({'dates': np.datetime_as_string(self.dates_dt64, unit='us'), 'euvalues': self._vals_arr},
+                        copy=False)
+        ascii.write(out_tab, outname, format='fast_basic', overwrite=True)
 
     def timed_stats(self, sigma=3):
         """Break up the data into chunks of the given duration. Calculate the
@@ -1249,44 +1798,61 @@ class EdbMnemonic:
         sigma : int
             Number of sigma to use in sigma-clipping
         """
-        if type(self.data["euvalues"].data[0]) not in [np.str_, str]:
+        self._stats_pending = False
+
+        # Statistics cannot be calculated for string data, and there is nothing to
+        # bin for empty data or data at a single time
+        num_bins = 0
+        if len(self) > 1 and type(self._vals_arr[0]) not in [np.str_, str]:
             duration_secs = self.mean_time_block.to('second').value
-            date_arr = np.array(self.data["dates"])
-            num_bins = (np.max(self.data["dates"]) - np.min(self.data["dates"])).total_seconds() / duration_secs
+            num_bins = (self.data_end_time - self.data_start_time).total_seconds() / duration_secs
 
             # Round up to the next integer if there is a fractional number of bins
-            num_bins = np.ceil(num_bins)
+            num_bins = int(np.ceil(num_bins))
 
-            self.mean = []
-            self.median = []
-            self.max = []
-            self.min = []
-            self.stdev = []
-            self.median_times = []
-            for i in range(int(num_bins)):
-                min_date = self.data["dates"][0] + timedelta(seconds=i * duration_secs)
-                max_date = min_date + timedelta(seconds=duration_secs)
-                good = ((date_arr >= min_date) & (date_arr < max_date))
-                if self.meta['TlmMnemonics'][0]['AllPoints'] != 0:
-                    avg, med, dev = sigma_clipped_stats(self.data["euvalues"][good], sigma=sigma)
-                    maxval = np.max(self.data["euvalues"][good])
-                    minval = np.min(self.data["euvalues"][good])
-                else:
-                    avg, med, dev, maxval, minval = change_only_stats(self.data["dates"][good], self.data["euvalues"][good], sigma=sigma)
-                if np.isfinite(avg):
-                    self.mean.append(avg)
-                    self.median.append(med)
-                    self.stdev.append(dev)
-                    self.max.append(maxval)
-                    self.min.append(minval)
-                    self.median_times.append(calc_median_time(self.data["dates"].data[good]))
-        else:
+        if num_bins == 0:
             self.mean = []
             self.median = []
             self.stdev = []
             self.max = []
             self.min = []
             self.median_times = []
+            return
+
+        # Find the indexes of the bin edges within the sorted dates, so that each
+        # bin is a contiguous slice of the data
+        dates = self.dates_dt64
+        offsets = np.rint(np.arange(num_bins + 1) * duration_secs * 1e6).astype(np.int64)
+        edges = np.searchsorted(dates, dates[0] + offsets.astype('timedelta64[us]'))
+        bin_medtimes = _block_median_times(dates, edges)
+        vals = self._vals_arr
+
+        # Fill in the statistics of each bin, then keep only the bins that
+        # contain data and have a finite mean. Only the bins containing data
+        # are visited.
+        means = np.full(num_bins, np.nan)
+        medians = np.empty(num_bins)
+        stdevs = np.empty(num_bins)
+        maxs = np.empty(num_bins)
+        mins = np.empty(num_bins)
+        filled_bins = np.nonzero(edges[:-1] < edges[1:])[0]
+        if self._all_points:
+            for i in filled_bins:
+                bin_vals = vals[edges[i]:edges[i + 1]]
+                means[i], medians[i], stdevs[i] = _sigma_clipped_stats(bin_vals, sigma=sigma)
+                maxs[i] = np.max(bin_vals)
+                mins[i] = np.min(bin_vals)
+        else:
+            for i in filled_bins:
+                good = slice(edges[i], edges[i + 1])
+                means[i], medians[i], stdevs[i], maxs[i], mins[i] = change_only_stats(dates[good], vals[good], sigma=sigma)
+        keep = np.isfinite(means)
+        self.mean = means[keep]
+        self.median = medians[keep]
+        self.stdev = stdevs[keep]
+        self.max = maxs[keep]
+        self.min = mins[keep]
+        self.median_times = bin_medtimes[keep]
 
 
 def add_limit_boxes(fig, yellow=None, red=None):
@@ -1322,24 +1888,24 @@ def add_limit_boxes(fig, yellow=None, red=None):
             fig.add_layout(yellow_high)
             yellow_low = BoxAnnotation(bottom=red[0], top=yellow[0], fill_color='gold', fill_alpha=0.2)
             fig.add_layout(yellow_low)
-            red_high = BoxAnnotation(bottom=red[1], top=red[1] + 100, fill_color='red', fill_alpha=0.1)
+            red_high = BoxAnnotation(bottom=red[1], fill_color='red', fill_alpha=0.1)
             fig.add_layout(red_high)
-            red_low = BoxAnnotation(bottom=red[0] - 100, top=red[0], fill_color='red', fill_alpha=0.1)
+            red_low = BoxAnnotation(top=red[0], fill_color='red', fill_alpha=0.1)
             fig.add_layout(red_low)
 
         else:
-            yellow_high = BoxAnnotation(bottom=yellow[1], top=yellow[1] + 100, fill_color='gold', fill_alpha=0.2)
+            yellow_high = BoxAnnotation(bottom=yellow[1], fill_color='gold', fill_alpha=0.2)
             fig.add_layout(yellow_high)
-            yellow_low = BoxAnnotation(bottom=yellow[0] - 100, top=yellow[0], fill_color='gold', fill_alpha=0.2)
+            yellow_low = BoxAnnotation(top=yellow[0], fill_color='gold', fill_alpha=0.2)
             fig.add_layout(yellow_low)
 
     else:
         if red is not None:
             green = BoxAnnotation(bottom=red[0], top=red[1], fill_color='chartreuse', fill_alpha=0.2)
             fig.add_layout(green)
-            red_high = BoxAnnotation(bottom=red[1], top=red[1] + 100, fill_color='red', fill_alpha=0.1)
+            red_high = BoxAnnotation(bottom=red[1], fill_color='red', fill_alpha=0.1)
             fig.add_layout(red_high)
-            red_low = BoxAnnotation(bottom=red[0] - 100, top=red[0], fill_color='red', fill_alpha=0.1)
+            red_low = BoxAnnotation(top=red[0], fill_color='red', fill_alpha=0.1)
             fig.add_layout(red_low)
 
     return fig
@@ -1350,7 +1916,7 @@ def add_time_offset(offset, dt_obj):
 
     Parameters
     ----------
-    offset : float
+    offset : float or numpy.ndarray
         Number of seconds to be added
 
     dt_obj : datetime.datetime
@@ -1358,10 +1924,18 @@ def add_time_offset(offset, dt_obj):
 
     Returns
     -------
-    obj : datetime.datetime
-        Sum of the input datetime objects and the offset seconds.
+    obj : datetime.datetime or numpy.ndarray
+        Sum of the input datetime objects and the offset seconds. If ``offset``
+        is an array, this is an array of datetime objects.
     """
-    return dt_obj + timedelta(seconds=offset)
+    if np.ndim(offset) == 0:
+        return dt_obj + timedelta(seconds=offset)
+
+    # Scale the whole and fractional seconds separately, rounding to the nearest
+    # microsecond half to even, as timedelta does
+    frac_sec, whole_sec = np.modf(np.asarray(offset, dtype=np.float64))
+    offset_us = whole_sec.astype(np.int64) * 1000000 + np.rint(frac_sec * 1e6).astype(np.int64)
+    return (np.datetime64(dt_obj, 'us') + offset_us.astype('timedelta64[us]')).astype(datetime)
 
 
 def calc_median_time(time_arr):
@@ -1378,7 +1952,11 @@ def calc_median_time(time_arr):
         Median time, as a datetime object
     """
     if len(time_arr) > 0:
-        med_time = time_arr[0] + ((time_arr[-1] - time_arr[0]) / 2.)
+        # Only the first and last times are needed. Halve the span in integer
+        # microseconds, rounding half to even as timedelta division does.
+        first, last = _to_datetime64([time_arr[0], time_arr[-1]])
+        half_span = np.rint((last - first).astype(np.int64) / 2.).astype(np.int64)
+        med_time = (first + half_span.astype('timedelta64[us]')).astype(datetime)
     else:
         med_time = np.nan
     return med_time
@@ -1392,7 +1970,7 @@ def change_only_bounding_points(date_list, value_list, starttime, endtime):
     Parameters
     ----------
     date_list : list
-        List of datetime values
+        List of datetime values, sorted in time
 
     value_list : list
         List of corresponding mnemonic values
@@ -1411,53 +1989,56 @@ def change_only_bounding_points(date_list, value_list, starttime, endtime):
     value_list : list
         List of corresponding mnemonic values
     """
-    date_list_arr = np.array(date_list)
-
     if isinstance(starttime, Time):
         starttime = starttime.datetime
 
     if isinstance(endtime, Time):
         endtime = endtime.datetime
 
-    valid_idx = np.where((date_list_arr <= endtime) & (date_list_arr >= starttime))[0]
-    before_startime = np.where(date_list_arr < starttime)[0]
-    before_endtime = np.where(date_list_arr < endtime)[0]
+    # The dates are sorted, so the points inside and before the requested time
+    # range can be found by searching the datetime64 dates rather than by
+    # comparing every date to the start and end times
+    date_list_arr = _to_datetime64(date_list)
+    start_dt64 = np.datetime64(starttime, 'us')
+    end_dt64 = np.datetime64(endtime, 'us')
+    lo, before_end = np.searchsorted(date_list_arr, [start_dt64, end_dt64], side='left')
+    hi = np.searchsorted(date_list_arr, end_dt64, side='right')
 
     # The value at starttime is either the value of the last point before starttime,
     # or NaN if there are no points prior to starttime
-    if len(before_startime) == 0:
+    if lo == 0:
         value0 = np.nan
     else:
-        value0 = value_list[before_startime[-1]]
+        value0 = value_list[lo - 1]
 
     # The value at endtime is NaN if there are no times before the endtime.
     # Otherwise the value is equal to the value at the last point before endtime
-    if len(before_endtime) == 0:
+    if before_end == 0:
         value_end = np.nan
     else:
-        value_end = value_list[before_endtime[-1]]
-
-    # Crop the arrays down to the times between starttime and endtime
-    date_list = list(np.array(date_list)[valid_idx])
-    value_list = list(np.array(value_list)[valid_idx])
+        value_end = value_list[before_end - 1]
 
     # Add an entry for starttime and another for endtime, but not if
-    # the values are NaN
+    # the values are NaN. The entries are placed around the cropped data
+    # as the output lists are built, rather than inserted at the front
+    # afterwards.
+    first_dates, first_values = [], []
     if isinstance(value0, Number):
         if not np.isnan(value0):
-            date_list.insert(0, starttime)
-            value_list.insert(0, value0)
+            first_dates, first_values = [starttime], [value0]
     elif isinstance(value0, str):
-        date_list.insert(0, starttime)
-        value_list.insert(0, value0)
+        first_dates, first_values = [starttime], [value0]
 
+    last_dates, last_values = [], []
     if isinstance(value_end, Number):
         if not np.isnan(value_end):
-            date_list.append(endtime)
-            value_list.append(value_end)
+            last_dates, last_values = [endtime], [value_end]
     elif isinstance(value_end, str):
-        date_list.append(endtime)
-        value_list.append(value_end)
+        last_dates, last_values = [endtime], [value_end]
+
+    # Crop the lists down to the times between starttime and endtime
+    date_list = first_dates + list(date_list[lo:hi]) + last_dates
+    value_list = first_values + list(value_list[lo:hi]) + last_values
 
     return date_list, value_list
 
@@ -1468,8 +2049,9 @@ def change_only_stats(times, values, sigma=3):
 
     Parameters
     ----------
-    times : list
-        List of datetime objects
+    times : list or numpy.ndarray
+        Datetime objects or ``numpy.datetime64`` values. Passing ``numpy.datetime64``
+        values avoids converting each datetime object.
 
     values : list
         List of values corresponding to times
@@ -1495,13 +2077,14 @@ def change_only_stats(times, values, sigma=3):
     if len(times) == 1:
         return values, values, 0., values, values
     else:
-        times = np.array(times)
         values = np.array(values)
-        delta_time = times[1:] - times[0:-1]
-        delta_time_weight = np.array([e.total_seconds() for e in delta_time])
+
+        # Weight each value by the number of seconds until the next value
+        delta_time_weight = np.empty(len(values))
+        delta_time_weight[0:-1] = np.diff(_to_datetime64(times)).astype(np.int64) / 1e6
 
         # Add weight for the final point. Set it to 1 microsecond
-        delta_time_weight = np.append(delta_time_weight, 1e-6)
+        delta_time_weight[-1] = 1e-6
 
         meanval = np.average(values, weights=delta_time_weight)
         stdevval = np.sqrt(np.average((values - meanval) ** 2, weights=delta_time_weight))
@@ -1515,7 +2098,7 @@ def change_only_stats(times, values, sigma=3):
 
         # Now we find the median by sorting the values, keeping a running total of the
         # total number of entries given that each value will have a number of instances
-        # dictat<ed by the weight, and selecting the value associated with the central
+        # dictated by the weight, and selecting the value associated with the central
         # element.
         total_num = np.sum(delta_time_weight)
         if np.mod(total_num, 2) == 1:
@@ -1526,45 +2109,52 @@ def change_only_stats(times, values, sigma=3):
             odd = False
         sorted_idx = np.argsort(values)
         values = values[sorted_idx]
-        delta_time_weight = delta_time_weight[sorted_idx]
-        total_idx = 0
-        for i, (val, weight) in enumerate(zip(values, delta_time_weight)):
-            total_idx += weight
-            if total_idx >= midpt:
-                if odd:
-                    medianval = val
-                else:
-                    if total_idx > midpt:
-                        medianval = val
-                    else:
-                        medianval = (val + values[i + 1]) / 2.
-                break
+        running_total = np.cumsum(delta_time_weight[sorted_idx])
+
+        # Index of the first value whose running total reaches the midpoint
+        i = np.searchsorted(running_total, midpt, side='left')
+        if odd or running_total[i] > midpt:
+            medianval = values[i]
+        else:
+            medianval = (values[i] + values[i + 1]) / 2.
 
     return meanval, medianval, stdevval, maxval, minval
 
 
+def clear_mnemonic_cache():
+    """Remove all entries from the mnemonic query cache used by ``get_mnemonic``,
+    so that subsequent queries are sent to the EDB.
+    """
+    with _MNEMONIC_CACHE_LOCK:
+        _MNEMONIC_CACHE.clear()
+
+
 def create_time_offset(dt_obj, epoch):
     """Subtract input epoch from a datetime object and return the
     residual number of seconds
 
     Parameters
     ----------
-    dt_obj : datetime.datetime
+    dt_obj : datetime.datetime, astropy.time.Time, or array of these
         Original datetiem object
 
-    epoch : datetime.datetime
+    epoch : datetime.datetime or astropy.time.Time
         Datetime to be subtracted from dt_obj
 
     Returns
     -------
-    obj : float
+    obj : float or numpy.ndarray
         Number of seconds between dt_obj and epoch
     """
     if isinstance(dt_obj, Time):
-        return (dt_obj - epoch).to(u.second).value
+        if dt_obj.isscalar:
+            return (dt_obj - epoch).to(u.second).value
     elif isinstance(dt_obj, datetime):
         return (dt_obj - epoch).total_seconds()
 
+    # Arrays of times are subtracted as datetime64 values
+    return (_to_datetime64(dt_obj) - _to_datetime64(epoch)) / np.timedelta64(1, 's')
+
 
 def get_mnemonic(mnemonic_identifier, start_time, end_time):
     """Execute query and return an ``EdbMnemonic`` instance.
@@ -1573,6 +2163,10 @@ def get_mnemonic(mnemonic_identifier, start_time, end_time):
     datapoint preceding the requested start time and the datapoint
     that follows the requested end time.
 
+    Results of queries that end in the past are cached for
+    ``MNEMONIC_CACHE_TTL`` seconds, so repeating a query within that
+    time returns a copy of the earlier result without contacting the EDB.
+
     Parameters
     ----------
     mnemonic_identifier : str
@@ -1589,8 +2183,13 @@ def get_mnemonic(mnemonic_identifier, start_time, end_time):
     mnemonic : instance of EdbMnemonic
         EdbMnemonic object containing query results
     """
-    base_url = get_mast_base_url()
-    service = ENGDB_Service(base_url)  # By default, will use the public MAST service.
+    # Return the results of an identical recent query if available
+    cache_key = (mnemonic_identifier, Time(start_time).isot, Time(end_time).isot)
+    mnemonic = _get_cached_mnemonic(cache_key)
+    if mnemonic is not None:
+        return mnemonic
+
+    service = _engdb_service()
 
     meta = service.get_meta(mnemonic_identifier)
 
@@ -1605,7 +2204,9 @@ def get_mnemonic(mnemonic_identifier, start_time, end_time):
     data = service.get_values(mnemonic_identifier, start_time, end_time, include_obstime=True,
                               include_bracket_values=bracket)
 
-    dates = [datetime.strptime(row.obstime.iso, "%Y-%m-%d %H:%M:%S.%f") for row in data]
+    # Parse all of the ISO date strings at once rather than with strptime on each row
+    iso_dates = np.array([row.obstime.iso for row in data], dtype='datetime64[us]')
+    dates = iso_dates.tolist()
     values = [row.value for row in data]
 
     if bracket:
@@ -1631,11 +2232,17 @@ def get_mnemonic(mnemonic_identifier, start_time, end_time):
         if len(mnemonic) > 0:
             mnemonic.change_only_add_points()
 
+    # Don't cache queries extending into the future, since new data may still arrive
+    if Time(end_time) < Time.now():
+        _cache_mnemonic(cache_key, mnemonic)
+
     return mnemonic
 
 
-def get_mnemonics(mnemonics, start_time, end_time):
-    """Query DMS EDB with a list of mnemonics and a time interval.
+def get_mnemonics(mnemonics, start_time, end_time, max_workers=None):
+    """Query DMS EDB with a list of mnemonics and a time interval. The
+    queries are run concurrently, since each one spends most of its time
+    waiting on MAST.
 
     Parameters
     ----------
@@ -1646,6 +2253,9 @@ def get_mnemonics(mnemonics, start_time, end_time):
         Start time
     end_time : astropy.time.Time instance
         End time
+    max_workers : int
+        Maximum number of queries to run at once. If None, up to 16
+        queries are run at once. Use 1 to run the queries serially.
 
     Returns
     -------
@@ -1657,15 +2267,27 @@ def get_mnemonics(mnemonics, start_time, end_time):
         raise RuntimeError('Please provide a list/array of mnemonic_identifiers')
 
     mnemonic_dict = OrderedDict()
-    for mnemonic_identifier in mnemonics:
-        # fill in dictionary
-        mnemonic_dict[mnemonic_identifier] = get_mnemonic(mnemonic_identifier, start_time, end_time)
+    if len(mnemonics) == 0:
+        return mnemonic_dict
+
+    if max_workers is None:
+        max_workers = min(16, len(mnemonics))
+
+    # map() returns the results in the order of the input mnemonics
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(lambda mnemonic_identifier: get_mnemonic(mnemonic_identifier, start_time, end_time),
+                               mnemonics)
+        for mnemonic_identifier, mnemonic in zip(mnemonics, results):
+            # fill in dictionary
+            mnemonic_dict[mnemonic_identifier] = mnemonic
 
     return mnemonic_dict
 
 
 def get_mnemonic_info(mnemonic_identifier):
-    """Return the mnemonic description.
+    """Return the mnemonic description. Descriptions do not change, so
+    each mnemonic is only queried once. Callers receive a copy of the
+    cached description, which they are free to modify.
 
     Parameters
     ----------
@@ -1677,21 +2299,23 @@ def get_mnemonic_info(mnemonic_identifier):
     info : dict
         Object that contains the returned data
     """
-    mast_token = get_mast_token()
-    return query_mnemonic_info(mnemonic_identifier, token=mast_token)
+    return copy.deepcopy(_mnemonic_info(mnemonic_identifier))
 
 
 def interpolate_datetimes(new_times, old_times, old_data):
     """interpolate a set of datetime/value pairs onto another set
-    of datetime objects
+    of datetime objects. The times are converted to integer microsecond
+    offsets so that ``numpy.interp`` works on plain int64 arrays.
 
     Parameters
     ----------
     new_times : numpy.ndarray
-        Array of datetime objects onto which the data will be interpolated
+        Array of datetime objects (or ``datetime64`` values) onto which
+        the data will be interpolated
 
     old_times : numpy.ndarray
-        Array of datetime objects associated with the input data values
+        Array of datetime objects (or ``datetime64`` values) associated
+        with the input data values
 
     old_data : numpy.ndarray
         Array of data values associated with ``old_times``, which will be
@@ -1704,9 +2328,11 @@ def interpolate_datetimes(new_times, old_times, old_data):
     """
     # We can only linearly interpolate if we have more than one entry
     if len(old_data) >= 2:
-        interp_times = np.array([create_time_offset(ele, old_times[0]) for ele in new_times])
-        mnem_times = np.array([create_time_offset(ele, old_times[0]) for ele in old_times])
-        new_data = np.interp(interp_times, mnem_times, old_data)
+        old_times = _to_datetime64(old_times)
+        epoch = old_times[0]
+        interp_times = (_to_datetime64(new_times) - epoch).astype(np.int64)
+        mnem_times = (old_times - epoch).astype(np.int64)
+        new_data = np.interp(interp_times, mnem_times, np.asarray(old_data, dtype=np.float64))
     else:
         # If there are not enough data and we are unable to interpolate,
         # then set the data table to be empty
@@ -1727,13 +2353,10 @@ def is_valid_mnemonic(mnemonic_identifier):
     bool
         Is mnemonic_identifier a valid EDB mnemonic?
     """
-    inventory = mnemonic_inventory()[0]
-    if mnemonic_identifier in inventory['tlmMnemonic']:
-        return True
-    else:
-        return False
+    return mnemonic_identifier in _mnemonic_names()
 
 
+@lru_cache(maxsize=1)
 def mnemonic_inventory():
     """Return all mnemonics in the DMS engineering database.
     No authentication is required, this information is public.
@@ -31,6 +31,8 @@ Use
 
 # Native Imports
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import datetime
 from glob import glob
 import logging
@@ -63,13 +65,69 @@ from jwql.database.database_interface import FGSCosmicRayStats
 from jwql.database.database_interface import session, engine
 from jwql.shared_tasks.shared_tasks import only_one, run_pipeline, run_parallel_pipeline
 from jwql.utils import mast_utils
-from jwql.utils.constants import JWST_INSTRUMENT_NAMES, JWST_INSTRUMENT_NAMES_MIXEDCASE, JWST_DATAPRODUCTS
+from jwql.utils.constants import JWST_INSTRUMENT_NAMES, JWST_DATAPRODUCTS
 from jwql.utils.logging_functions import configure_logging
 from jwql.utils.logging_functions import log_info
 from jwql.utils.logging_functions import log_fail
 from jwql.utils.utils import copy_files, ensure_dir_exists, get_config, filesystem_path, grouper
 
 
+# Apertures checked for cosmic rays, for each instrument
+POSSIBLE_APERTURES = {'nircam': ['NRCA1_FULL',
+                                 'NRCA2_FULL',
+                                 'NRCA3_FULL',
+                                 'NRCA4_FULL',
+                                 'NRCA5_FULL',
+
+                                 'NRCB1_FULL',
+                                 'NRCB2_FULL',
+                                 'NRCB3_FULL',
+                                 'NRCB4_FULL',
+                                 'NRCB5_FULL'],
+                      'miri': ['MIRIM_FULL',
+                               'MIRIM_ILLUM',
+                               'MIRIM_BRIGHTSKY',
+                               'MIRIM_SUB256',
+                               'MIRIM_SUB128',
+                               'MIRIM_SUB64',
+                               'MIRIM_CORON1065',
+                               'MIRIM_CORON1140',
+                               'MIRIM_CORON1550',
+                               'MIRIM_CORONLYOT',
+                               'MIRIM_SLITLESSPRISM',
+                               'MIRIFU_CHANNEL1A',
+                               'MIRIFU_CHANNEL1B'
+                               'MIRIFU_CHANNEL1C',
+                               'MIRIFU_CHANNEL2A',
+                               'MIRIFU_CHANNEL2B'
+                               'MIRIFU_CHANNEL2C',
+                               'MIRIFU_CHANNEL3A',
+                               'MIRIFU_CHANNEL3B'
+                               'MIRIFU_CHANNEL3C',
+                               'MIRIFU_CHANNEL4A',
+                               'MIRIFU_CHANNEL4B',
+                               'MIRIFU_CHANNEL4C'],
+                      'niriss': ['NIS_CEN'],
+                      'nirspec': ['NRS_FULL_MSA'],
+                      'fgs': ['FGS1_FULL', 'FGS2_FULL']
+                      }
+
+# Cosmic ray magnitude histogram bins
+MAGNITUDE_BINS = np.arange(65536 * 2 + 1, dtype=int) - 65536
+
+# Query history and stats tables, for each instrument
+QUERY_TABLES = {'nircam': NIRCamCosmicRayQueryHistory,
+                'niriss': NIRISSCosmicRayQueryHistory,
+                'miri': MIRICosmicRayQueryHistory,
+                'nirspec': NIRSpecCosmicRayQueryHistory,
+                'fgs': FGSCosmicRayQueryHistory}
+STATS_TABLES = {'nircam': NIRCamCosmicRayStats,
+                'niriss': NIRISSCosmicRayStats,
+                'miri': MIRICosmicRayStats,
+                'nirspec': NIRSpecCosmicRayStats,
+                'fgs': FGSCosmicRayStats}
+
+
 class CosmicRay:
     """Class for executing the cosmic ray monitor.
 
@@ -123,6 +181,66 @@ class CosmicRay:
     def __init__(self):
         """Initialize an instance of the ``Cosmic_Ray`` class."""
 
+    def analyze_file(self, file_name, jump_file, rate_file):
+        """Measure the cosmic rays in one exposure, using the outputs of
+        the jump and ramp fitting steps.
+
+        Parameters
+        ----------
+        file_name : str
+            Name of the uncal file
+
+        jump_file : str
+            Name of the jump step output file
+
+        rate_file : str
+            Name of the ramp fitting step output file
+
+        Returns
+        -------
+        cosmic_ray_db_entry : dict or None
+            Stats table entry for the exposure, or ``None`` if the
+            pipeline outputs could not be read
+        """
+        logging.info(f'\tUsing {jump_file} and {rate_file} to monitor CRs.')
+
+        jump_head, jump_data, jump_dq = self.get_jump_data(jump_file)
+        rate_data = self.get_rate_data(rate_file)
+        if jump_head is None or rate_data is None:
+            return None
+
+        jump_locs = self.get_jump_locs(jump_dq)
+        cosmic_ray_num = len(jump_locs)
+
+        logging.info(f'\tFound {cosmic_ray_num} CR-flags.')
+
+        # Translate CR count into a CR rate per pixel, so that all exposures
+        # can go on one plot regardless of exposure time and aperture size
+        cr_rate = self.get_cr_rate(cosmic_ray_num, jump_head)
+        logging.info(f'\tNormalizing by time and area, this is {cr_rate} jumps/sec/pixel.')
+
+        # Get observation time info
+        obs_times = Time([jump_head['EXPSTART'], jump_head['EXPEND']], format='mjd', scale='utc')
+        start_time, end_time = [obs_time.replace('T', ' ') for obs_time in obs_times.isot]
+
+        if cosmic_ray_num == 0:
+            # There are no jumps to measure, so record an empty histogram
+            cosmic_ray_mags, outlier_mags = [0] * len(MAGNITUDE_BINS), []
+        else:
+            cosmic_ray_mags, outlier_mags = self.get_cr_mags(jump_locs, None, rate_data, jump_data, jump_head)
+
+        cosmic_ray_db_entry = {'entry_date': datetime.datetime.now(),
+                               'aperture': self.aperture,
+                               'source_file': os.path.basename(file_name),
+                               'obs_start_time': start_time,
+                               'obs_end_time': end_time,
+                               'jump_count': cosmic_ray_num,
+                               'jump_rate': cr_rate,
+                               'magnitude': cosmic_ray_mags,
+                               'outliers': outlier_mags
+                               }
+        return cosmic_ray_db_entry
+
     def filter_bases(self, file_list):
         """Filter a list of input files. Strip off everything after the last
         underscore (e.g. "i2d.fits"), and keep only once instance of the
@@ -158,14 +276,12 @@ class CosmicRay:
         """Determine which database tables to use for a run of the
         cosmic ray monitor.
 
-        Uses the instrument variable to get the mixed-case instrument
-        name, and uses that name to find the query and stats tables
-        for that instrument.
+        Uses the instrument variable to look up the query and stats
+        tables for that instrument.
         """
 
-        mixed_case_name = JWST_INSTRUMENT_NAMES_MIXEDCASE[self.instrument]
-        self.query_table = eval('{}CosmicRayQueryHistory'.format(mixed_case_name))
-        self.stats_table = eval('{}CosmicRayStats'.format(mixed_case_name))
+        self.query_table = QUERY_TABLES[self.instrument]
+        self.stats_table = STATS_TABLES[self.instrument]
 
     def get_cr_mags(self, jump_locs, jump_locs_pre, rateints, jump_data, jump_head):
         """Gets the magnitude of each cosmic ray.
@@ -177,11 +293,12 @@ class CosmicRay:
         Parameters:
         ----------
 
-        jump_locs: list
-            List of coordinates to a pixel marked with a jump.
+        jump_locs: numpy.ndarray
+            (N, ndim) array of coordinates to pixels marked with a jump.
 
-        jump_locs_pre: list
-            List of matching coordinates one group before jump_locs.
+        jump_locs_pre: numpy.ndarray or None
+            Array of matching coordinates one group before jump_locs. If
+            None, the pixels one group before the jumps are found directly.
 
         rateints: ndarray
             Array in DN/s.
@@ -200,23 +317,18 @@ class CosmicRay:
             cosmic rays of each magnitude.
 
         """
-        mag_bins = np.arange(65536 * 2 + 1, dtype=int) - 65536
-        mags = np.zeros_like(mag_bins, dtype=int)
-        outliers = []
-        num_outliers = 0
-        total = 0
-
-        for coord, coord_gb in zip(jump_locs, jump_locs_pre):
-            total += 1
-            mag = self.magnitude(coord, coord_gb, rateints, jump_data, jump_head)
-            if abs(mag) > 65535:
-                num_outliers += 1
-                outliers.append(int(mag))
-            else:
-                mags[mag_bins[mag]] += 1
-
-        logging.info("{} of {} cosmic rays are beyond bin boundaries".format(num_outliers, total))
-        return [int(m) for m in mags], outliers
+        mag_bins = MAGNITUDE_BINS
+
+        all_mags = self.magnitude_batch(jump_locs, jump_locs_pre, rateints, jump_data, jump_head)
+        is_outlier = np.abs(all_mags) > 65535
+        outliers = all_mags[is_outlier].tolist()
+
+        # Count the magnitudes into the same bins as mags[mag_bins[mag]] += 1 would,
+        # with negative indexes wrapped around to the end of the array
+        mags = np.bincount(mag_bins[all_mags[~is_outlier]] % len(mag_bins), minlength=len(mag_bins))
+
+        logging.info("{} of {} cosmic rays are beyond bin boundaries".format(len(outliers), len(all_mags)))
+        return mags.tolist(), outliers
 
     def file_exists_in_database(self, filename):
         """Checks if an entry for filename exists in the cosmic ray stats
@@ -291,6 +403,9 @@ class CosmicRay:
 
     def get_jump_data(self, jump_filename):
         """Opens and reads a given .FITS file containing cosmic rays.
+        The file is memory-mapped and only the needed HDUs are loaded, so
+        the science data are only read from disk where they are used
+        (i.e. at the jump locations).
 
         Parameters:
         ----------
@@ -310,12 +425,13 @@ class CosmicRay:
 
         """
         try:
-            with fits.open(jump_filename) as hdu:
+            with fits.open(jump_filename, memmap=True, lazy_load_hdus=True) as hdu:
                 head = hdu[0].header
                 data = hdu[1].data
                 dq = hdu[3].data
-        except (IndexError, FileNotFoundError):
-            logging.warning(f'Could not open jump file: {jump_file} Skipping')
+        except (IndexError, OSError, fits.verify.VerifyError) as e:
+            logging.warning(f'Could not open jump file: {jump_filename} Skipping')
+            logging.warning(e)
             head = data = dq = None
 
         return head, data, dq
@@ -331,25 +447,35 @@ class CosmicRay:
 
         Returns:
         -------
-        jump_locs: list
-            List of coordinates to a pixel marked with a jump.
+        jump_locs: numpy.ndarray
+            (N, ndim) array of coordinates to pixels marked with a jump.
         """
-
-        temp = np.where(dq & dqflags.pixel["JUMP_DET"] > 0)
-
-        jump_locs = []
-
-        if len(temp) == 4:
-            for i in range(len(temp[0])):
-                jump_locs.append((temp[0][i], temp[1][i], temp[2][i], temp[3][i]))
-        elif len(temp) == 3:
-            for i in range(len(temp[0])):
-                jump_locs.append((temp[0][i], temp[1][i], temp[2][i]))
-        elif len(temp) == 0:
-            # This is the (unlikely) case where the data contain no flagged CRs
-            pass
-        else:
-            logging.error(f'dq has {len(temp)} dimensions. We expect it to have 3 or 4.')
+        if dq.ndim not in [3, 4]:
+            logging.error(f'dq has {dq.ndim} dimensions. We expect it to have 3 or 4.')
+            return np.zeros((0, dq.ndim), dtype=np.int32)
+
+        # Search one (y, x) plane at a time, so that only one plane of the
+        # (memory-mapped) DQ array and its jump mask are in memory at once
+        planes = dq.reshape((-1,) + dq.shape[-2:])
+        plane_locs = []
+        jump_flag = dqflags.pixel["JUMP_DET"]
+        for plane_num, plane in enumerate(planes):
+            # Test the jump bit, so that pixels with other flags set as well are found
+            plane_ys, plane_xs = np.nonzero((plane & jump_flag) != 0)
+            if len(plane_ys) > 0:
+                # One int32 row per flagged pixel, so that the 64-bit indexes
+                # from nonzero never exist for more than one plane at a time
+                locs = np.empty((len(plane_ys), dq.ndim), dtype=np.int32)
+                locs[:, :-2] = np.unravel_index(plane_num, dq.shape[:-2])
+                locs[:, -2] = plane_ys
+                locs[:, -1] = plane_xs
+                plane_locs.append(locs)
+
+        # This is the (unlikely) case where the data contain no flagged CRs
+        if len(plane_locs) == 0:
+            return np.zeros((0, dq.ndim), dtype=np.int32)
+
+        jump_locs = np.concatenate(plane_locs)
 
         return jump_locs
 
@@ -367,42 +493,41 @@ class CosmicRay:
             FITS data
         """
         try:
-            data = fits.getdata(rate_filename)
-        except FileNotFoundError:
-            logging.warning(f'Could not open rate file: {rate_file} Skipping')
+            data = fits.getdata(rate_filename, memmap=True)
+        except (IndexError, OSError, fits.verify.VerifyError) as e:
+            logging.warning(f'Could not open rate file: {rate_filename} Skipping')
+            logging.warning(e)
             data = None
 
         return data
 
     def group_before(self, jump_locs):
-        """Creates a list of coordinates one group before given jump
+        """Creates an array of coordinates one group before given jump
         coordinates.
 
         Parameters:
         ----------
-        jump_locs: list
-            List of coordinates to a pixel marked with a jump.
+        jump_locs: numpy.ndarray
+            (N, ndim) array of coordinates to pixels marked with a jump.
 
         Returns:
         -------
-        jump_locs_pre: list
-            List of matching coordinates one group before jump_locs.
+        jump_locs_pre: numpy.ndarray
+            Array of matching coordinates one group before jump_locs.
         """
-
-        jump_locs_pre = []
+        jump_locs = np.asarray(jump_locs)
 
         if len(jump_locs) == 0:
             logging.error("No entries in jump_locs!")
-            return []
-
-        if len(jump_locs[0]) == 4:
-            for coord in jump_locs:
-                jump_locs_pre.append((coord[0], coord[1] - 1, coord[2], coord[3]))
-        elif len(jump_locs[0]) == 3:
-            for coord in jump_locs:
-                jump_locs_pre.append((coord[0] - 1, coord[1], coord[2]))
-        else:
-            logging.error(f'jump_locs has {len(jump_locs[0])} dimensions. Expecting 3 or 4.')
+            return jump_locs.copy()
+
+        # The group axis is the third from the end: (integration,) group, y, x
+        if jump_locs.shape[1] not in [3, 4]:
+            logging.error(f'jump_locs has {jump_locs.shape[1]} dimensions. Expecting 3 or 4.')
+            return np.zeros((0, jump_locs.shape[1]), dtype=jump_locs.dtype)
+
+        jump_locs_pre = jump_locs.copy()
+        jump_locs_pre[:, -3] -= 1
 
         return jump_locs_pre
 
@@ -444,6 +569,76 @@ class CosmicRay:
 
         return int(np.round(np.nan_to_num(cr_mag)))
 
+    def magnitude_batch(self, coords, coords_gb, rateints, data, head):
+        """Calculates the magnitudes of many jumps at once, given their
+        coordinates in an array of pixels. This gives the same results as
+        calling ``magnitude`` on each jump.
+
+        Parameters:
+        ----------
+        coords: numpy.ndarray
+            (N, ndim) array of jump coordinates.
+
+        coords_gb: numpy.ndarray or None
+            Array of the coordinates of the jump pixels one group before.
+            If None, those pixels are found from ``coords`` without
+            building a second coordinate array.
+
+        rateints: ndarray
+            Array in DN/s.
+
+        data: ndarray
+            Ndarray containing image data cube
+
+        head: FITS header
+            Header containing file information.
+
+        Returns:
+        -------
+        cr_mags: numpy.ndarray
+            The magnitudes of the cosmic rays, rounded to integers
+        """
+        coords = np.asarray(coords)
+        if len(coords) == 0:
+            return np.zeros(0, dtype=int)
+
+        grouptime = head['TGROUP']
+
+        # Look up the values through flat indexes into the raveled arrays, which is
+        # faster than indexing with one array per axis. mode='wrap' gives negative
+        # indexes the same meaning as in regular indexing.
+        data = np.asarray(data)
+        rateints = np.asarray(rateints)
+        data_flat = data.reshape(-1)
+        rate_flat = rateints.reshape(-1)
+        if self.nints == 1:
+            # Only the last three coordinates (group, y, x) are needed for the single
+            # integration, and the first integration starts the flattened data
+            flat = np.ravel_multi_index((coords[:, -3], coords[:, -2], coords[:, -1]), data.shape[1:], mode='wrap')
+            if coords_gb is not None:
+                coords_gb = np.asarray(coords_gb)
+                flat_gb = np.ravel_multi_index((coords_gb[:, -3], coords_gb[:, -2], coords_gb[:, -1]), data.shape[1:],
+                                               mode='wrap')
+            flat_rate = np.ravel_multi_index((coords[:, -2], coords[:, -1]), rateints.shape, mode='wrap')
+
+        else:
+            flat = np.ravel_multi_index(tuple(coords.T), data.shape, mode='wrap')
+            if coords_gb is not None:
+                flat_gb = np.ravel_multi_index(tuple(np.asarray(coords_gb).T), data.shape, mode='wrap')
+            flat_rate = np.ravel_multi_index((coords[:, 0], coords[:, -2], coords[:, -1]), rateints.shape, mode='wrap')
+
+        if coords_gb is None:
+            # The previous group is one (y, x) plane earlier in the flattened data,
+            # except that group 0 wraps around to the last group of the integration
+            ngroups = data.shape[-3]
+            plane_size = data.shape[-2] * data.shape[-1]
+            flat_gb = flat - plane_size
+            flat_gb[coords[:, -3] % ngroups == 0] += ngroups * plane_size
+
+        cr_mags = data_flat[flat] - data_flat[flat_gb] - rate_flat[flat_rate] * grouptime
+
+        return np.round(np.nan_to_num(cr_mags)).astype(int)
+
     def most_recent_search(self):
         """Adapted from Dark Monitor (Bryan Hilbert)
 
@@ -497,54 +692,7 @@ class CosmicRay:
             A list of possible apertures to check for the given
             instrument
         """
-        if inst.lower() == 'nircam':
-            apers = ['NRCA1_FULL',
-                     'NRCA2_FULL',
-                     'NRCA3_FULL',
-                     'NRCA4_FULL',
-                     'NRCA5_FULL',
-
-                     'NRCB1_FULL',
-                     'NRCB2_FULL',
-                     'NRCB3_FULL',
-                     'NRCB4_FULL',
-                     'NRCB5_FULL']
-
-        if inst.lower() == 'miri':
-            apers = ['MIRIM_FULL',
-                     'MIRIM_ILLUM',
-                     'MIRIM_BRIGHTSKY',
-                     'MIRIM_SUB256',
-                     'MIRIM_SUB128',
-                     'MIRIM_SUB64',
-                     'MIRIM_CORON1065',
-                     'MIRIM_CORON1140',
-                     'MIRIM_CORON1550',
-                     'MIRIM_CORONLYOT',
-                     'MIRIM_SLITLESSPRISM',
-                     'MIRIFU_CHANNEL1A',
-                     'MIRIFU_CHANNEL1B'
-                     'MIRIFU_CHANNEL1C',
-                     'MIRIFU_CHANNEL2A',
-                     'MIRIFU_CHANNEL2B'
-                     'MIRIFU_CHANNEL2C',
-                     'MIRIFU_CHANNEL3A',
-                     'MIRIFU_CHANNEL3B'
-                     'MIRIFU_CHANNEL3C',
-                     'MIRIFU_CHANNEL4A',
-                     'MIRIFU_CHANNEL4B',
-                     'MIRIFU_CHANNEL4C']
-
-        if inst.lower() == 'niriss':
-            apers = ['NIS_CEN']
-
-        if inst.lower() == 'nirspec':
-            apers = ['NRS_FULL_MSA']
-
-        if inst.lower() == 'fgs':
-            apers = ['FGS1_FULL', 'FGS2_FULL']
-
-        return apers
+        return POSSIBLE_APERTURES[inst.lower()]
 
     def process(self, file_list):
         """The main method for processing files. See module docstrings
@@ -556,177 +704,116 @@ class CosmicRay:
             List of filenames (including full paths) to the cosmic ray
             files
         """
-        for file_chunk in grouper(file_list, 100):
-
-            input_files = []
-            in_ext = "uncal"
-            out_exts = defaultdict(lambda: ['jump', '0_ramp_fit'])
-            instrument = self.instrument
-            existing_files = {}
-            no_coord_files = []
-
-            for file_name in file_chunk:
-
-                # Dont process files that already exist in the bias stats database
-                logging.info("Checking for {} in database".format(os.path.basename(file_name)))
-                file_exists = self.file_exists_in_database(os.path.basename(file_name))
-                if file_exists:
-                    logging.info('\t{} already exists in the bias database table.'.format(file_name))
-                    continue
-
-                file_basename = os.path.basename(file_name)
-                dir_name = file_basename[:19]  # jw###########_#####
-
-                self.obs_dir = os.path.join(self.data_dir, dir_name)
-                logging.info(f'Setting obs_dir to {self.obs_dir}')
-                ensure_dir_exists(self.obs_dir)
-
-                if 'uncal' in file_name:
-                    head = fits.getheader(file_name)
-                    self.nints = head['NINTS']
-
-                    copied, failed_to_copy = copy_files([file_name], self.obs_dir)
-                    # If the file cannot be copied to the working directory, skip it
-                    if len(failed_to_copy) > 0:
+        # Analyze files on the number of cores given in the config file,
+        # or on all of them if it is not set
+        cores = get_config().get('cores')
+        max_workers = int(cores) if cores else None
+
+        pending_analyses = None
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for file_chunk in grouper(file_list, 100):
+
+                input_files = []
+                in_ext = "uncal"
+                out_exts = defaultdict(lambda: ['jump', '0_ramp_fit'])
+                instrument = self.instrument
+                existing_files = {}
+                file_nints = {}
+                analysis_files = []
+
+                for file_name in file_chunk:
+
+                    # Dont process files that already exist in the bias stats database
+                    logging.info("Checking for {} in database".format(os.path.basename(file_name)))
+                    file_exists = self.file_exists_in_database(os.path.basename(file_name))
+                    if file_exists:
+                        logging.info('\t{} already exists in the bias database table.'.format(file_name))
                         continue
 
-                    # Next we run the pipeline on the files to get the proper outputs
-                    uncal_file = os.path.join(self.obs_dir, os.path.basename(file_name))
-                    jump_file = uncal_file.replace("uncal", "jump")
-                    rate_file = uncal_file.replace("uncal", "0_ramp_fit")
-                    if self.nints > 1:
-                        rate_file = rate_file.replace("0_ramp_fit", "1_ramp_fit")
+                    file_basename = os.path.basename(file_name)
+                    dir_name = file_basename[:19]  # jw###########_#####
 
-                    if (not os.path.isfile(jump_file)) or (not os.path.isfile(rate_file)):
-                        logging.info("Adding {} to calibration tasks".format(uncal_file))
+                    self.obs_dir = os.path.join(self.data_dir, dir_name)
+                    logging.info(f'Setting obs_dir to {self.obs_dir}')
+                    ensure_dir_exists(self.obs_dir)
 
-                        short_name = os.path.basename(uncal_file).replace('_uncal.fits', '')
+                    if 'uncal' in file_name:
+                        head = fits.getheader(file_name)
+                        self.nints = head['NINTS']
 
-                        input_files.append(uncal_file)
-                        if self.nints > 1:
-                            out_exts[short_name] = ['jump', '1_ramp_fit']
-                    else:
-                        logging.info("Calibrated files for {} already exist".format(uncal_file))
-                        existing_files[uncal_file] = [jump_file, rate_file]
-
-            output_files = run_parallel_pipeline(input_files, in_ext, out_exts, instrument, jump_pipe=True)
-            for file_name in existing_files:
-                if file_name not in input_files:
-                    input_files.append(file_name)
-                    output_files[file_name] = existing_files[file_name]
-
-            for file_name in input_files:
-
-                head = fits.getheader(file_name)
-                self.nints = head['NINTS']
-
-                dir_name = '_'.join(os.path.basename(file_name).split('_')[:2])  # file_name[51:76]
-                self.obs_dir = os.path.join(self.data_dir, dir_name)
-
-                if file_name not in output_files:
-                    skip = False
-                    head = fits.getheader(file_name)
-                    nints = head['NINTS']
-                    out_exts = ["jump", "0_ramp_fit"]
-                    if nints > 1:
-                        out_exts[-1] = "1_ramp_fit"
-                    for ext in out_exts:
-                        ext_file = os.path.basename(file_name).replace("uncal", "ext")
-                        if not os.path.isfile(os.path.join(self.obs_dir, ext_file)):
-                            logging.warning("\tOutput {} missing".format(ext_file))
-                            logging.warning("\tSkipping {}".format(os.path.basename(file_name)))
-                            skip = True
-                    if skip:
-                        continue
-
-                obs_files = output_files[file_name]
-
-                # Next we analyze the cosmic rays in the new data
-                for output_file in obs_files:
-                    logging.info("Checking output file {}".format(output_file))
-
-                    if 'jump' in output_file:
-                        logging.debug("Adding jump file {}".format(os.path.basename(output_file)))
-                        jump_file = os.path.join(self.obs_dir, os.path.basename(output_file))
-
-                    if self.nints == 1:
-                        logging.debug("Looking for single integration rate file")
-                        if '0_ramp_fit' in output_file:
-                            logging.debug("Adding rate file {}".format(os.path.basename(output_file)))
-                            rate_file = os.path.join(self.obs_dir, os.path.basename(output_file))
-
-                    elif self.nints > 1:
-                        logging.debug("Looking for multi-integration rate file")
-                        if '1_ramp_fit' in output_file:
-                            logging.debug("Adding rate file {}".format(os.path.basename(output_file)))
-                            rate_file = os.path.join(self.obs_dir, os.path.basename(output_file))
-
-                logging.info(f'\tUsing {jump_file} and {rate_file} to monitor CRs.')
-
-                jump_head, jump_data, jump_dq = self.get_jump_data(jump_file)
-                rate_data = self.get_rate_data(rate_file)
-                if jump_head is None or rate_data is None:
-                    continue
-
-                jump_locs = self.get_jump_locs(jump_dq)
-                if len(jump_locs) == 0:
-                    no_coord_files.append(os.path.basename(file_name))
-                jump_locs_pre = self.group_before(jump_locs)
-                cosmic_ray_num = len(jump_locs)
-
-                logging.info(f'\tFound {cosmic_ray_num} CR-flags.')
-
-                # Translate CR count into a CR rate per pixel, so that all exposures
-                # can go on one plot regardless of exposure time and aperture size
-                cr_rate = self.get_cr_rate(cosmic_ray_num, jump_head)
-                logging.info(f'\tNormalizing by time and area, this is {cr_rate} jumps/sec/pixel.')
-
-                # Get observation time info
-                obs_start_time = jump_head['EXPSTART']
-                obs_end_time = jump_head['EXPEND']
-                start_time = Time(obs_start_time, format='mjd', scale='utc').isot.replace('T', ' ')
-                end_time = Time(obs_end_time, format='mjd', scale='utc').isot.replace('T', ' ')
-
-                cosmic_ray_mags, outlier_mags = self.get_cr_mags(jump_locs, jump_locs_pre, rate_data, jump_data, jump_head)
-
-                # Insert new data into database
-                try:
-                    logging.info("Inserting {} in database".format(os.path.basename(file_name)))
-                    cosmic_ray_db_entry = {'entry_date': datetime.datetime.now(),
-                                           'aperture': self.aperture,
-                                           'source_file': os.path.basename(file_name),
-                                           'obs_start_time': start_time,
-                                           'obs_end_time': end_time,
-                                           'jump_count': cosmic_ray_num,
-                                           'jump_rate': cr_rate,
-                                           'magnitude': cosmic_ray_mags,
-                                           'outliers': outlier_mags
-                                           }
-                    with engine.begin() as connection:
-                        connection.execute(self.stats_table.__table__.insert(), cosmic_ray_db_entry)
-
-                    logging.info("Successfully inserted into database. \n")
-
-                    # Delete fits files in order to save disk space
-                    logging.info("Removing pipeline products in order to save disk space. \n")
-                    try:
-                        for file in [file_name, jump_file, rate_file]:
-                            if os.path.isfile(file):
-                                os.remove(file)
-                        if os.path.exists(self.obs_dir):
-                            os.rmdir(self.obs_dir)
-                    except OSError as e:
-                        logging.error(f"Unable to delete {self.obs_dir}")
-                        logging.error(e)
-                except (StatementError, DataError, DatabaseError, InvalidRequestError, OperationalError) as e:
-                    logging.error("Could not insert entry into database. \n")
-                    logging.error(e)
-
-            if len(no_coord_files) > 0:
-                logging.error("{} files had no jump co-ordinates".format(len(no_coord_files)))
-                for file_name in no_coord_files:
-                    logging.error("\t{} had no jump co-ordinates".format(file_name))
+                        copied, failed_to_copy = copy_files([file_name], self.obs_dir)
+                        # If the file cannot be copied to the working directory, skip it
+                        if len(failed_to_copy) > 0:
+                            continue
 
+                        # Next we run the pipeline on the files to get the proper outputs
+                        uncal_file = os.path.join(self.obs_dir, os.path.basename(file_name))
+                        file_nints[uncal_file] = self.nints
+                        jump_file = uncal_file.replace("uncal", "jump")
+                        rate_file = uncal_file.replace("uncal", "0_ramp_fit")
+                        if self.nints > 1:
+                            rate_file = rate_file.replace("0_ramp_fit", "1_ramp_fit")
+
+                        if (not os.path.isfile(jump_file)) or (not os.path.isfile(rate_file)):
+                            logging.info("Adding {} to calibration tasks".format(uncal_file))
+
+                            short_name = os.path.basename(uncal_file).replace('_uncal.fits', '')
+
+                            input_files.append(uncal_file)
+                            if self.nints > 1:
+                                out_exts[short_name] = ['jump', '1_ramp_fit']
+                        else:
+                            logging.info("Calibrated files for {} already exist".format(uncal_file))
+                            existing_files[uncal_file] = [jump_file, rate_file]
+
+                output_files = run_parallel_pipeline(input_files, in_ext, out_exts, instrument, jump_pipe=True)
+                for file_name in existing_files:
+                    if file_name not in input_files:
+                        input_files.append(file_name)
+                        output_files[file_name] = existing_files[file_name]
+
+                for file_name in input_files:
+
+                    # Reuse the number of integrations read from the uncal header above
+                    self.nints = file_nints[file_name]
+
+                    dir_name = '_'.join(os.path.basename(file_name).split('_')[:2])  # file_name[51:76]
+                    self.obs_dir = os.path.join(self.data_dir, dir_name)
+
+                    # The pipeline outputs are named after the uncal file, so there is
+                    # no need to search the output list for them
+                    short_name = os.path.basename(file_name).replace('_uncal.fits', '')
+                    rate_ext = '1_ramp_fit' if self.nints > 1 else '0_ramp_fit'
+                    jump_file = os.path.join(self.obs_dir, f'{short_name}_jump.fits')
+                    rate_file = os.path.join(self.obs_dir, f'{short_name}_{rate_ext}.fits')
+
+                    if file_name not in output_files:
+                        skip = False
+                        for ext_file in [jump_file, rate_file]:
+                            if not os.path.isfile(ext_file):
+                                logging.warning("\tOutput {} missing".format(os.path.basename(ext_file)))
+                                logging.warning("\tSkipping {}".format(os.path.basename(file_name)))
+                                skip = True
+                        if skip:
+                            continue
+
+                    analysis_files.append((file_name, jump_file, rate_file, self.nints, self.obs_dir))
+
+                # Start analyzing the cosmic rays in the new data. The exposures
+                # are independent, so they are analyzed in parallel, while the
+                # next chunk of files goes through the pipeline.
+                analyses = [(executor.submit(_analyze_file, self.aperture, nints, file_name, jump_file, rate_file),
+                             file_name, jump_file, rate_file, obs_dir)
+                            for file_name, jump_file, rate_file, nints, obs_dir in analysis_files]
+
+                # Save the results for the previous chunk, whose analyses have
+                # been running during this chunk's pipeline calls
+                if pending_analyses is not None:
+                    self.save_analyses(pending_analyses)
+                pending_analyses = analyses
+
+            if pending_analyses is not None:
+                self.save_analyses(pending_analyses)
 
     def pull_filenames(self, file_info):
         """Extract filenames from the list of file information returned from
@@ -825,6 +912,70 @@ class CosmicRay:
                     connection.execute(self.query_table.__table__.insert(), new_entry)
                 logging.info('\tUpdated the query history table')
 
+    def save_analyses(self, analyses):
+        """Wait for the cosmic ray analyses of a chunk of files, insert the
+        results into the stats table, and remove the pipeline products of
+        the files that were saved.
+
+        Parameters
+        ----------
+        analyses : list
+            ``(future, file_name, jump_file, rate_file, obs_dir)`` tuples,
+            where ``future`` gives the result of ``analyze_file``
+        """
+        no_coord_files = []
+        cosmic_ray_db_entries = []
+        processed_files = []
+        for future, file_name, jump_file, rate_file, obs_dir in analyses:
+            # If the worker process died (e.g. it ran out of memory), or the
+            # analysis could not read the file, skip only that file
+            try:
+                cosmic_ray_db_entry = future.result()
+            except (BrokenProcessPool, IndexError, OSError, fits.verify.VerifyError):
+                logging.exception(f'Cosmic ray analysis of {file_name} failed. Skipping')
+                continue
+            if cosmic_ray_db_entry is None:
+                continue
+            if cosmic_ray_db_entry['jump_count'] == 0:
+                no_coord_files.append(os.path.basename(file_name))
+
+            # Save the new entry, to be inserted into the database along
+            # with the rest of this chunk of files
+            cosmic_ray_db_entries.append(cosmic_ray_db_entry)
+            processed_files.append(([file_name, jump_file, rate_file], obs_dir))
+
+        # Insert new data into database
+        if len(cosmic_ray_db_entries) > 0:
+            try:
+                logging.info("Inserting {} entries in database".format(len(cosmic_ray_db_entries)))
+                with engine.begin() as connection:
+                    connection.execute(self.stats_table.__table__.insert(), cosmic_ray_db_entries)
+
+                logging.info("Successfully inserted into database. \n")
+
+                # Delete fits files in order to save disk space. The next chunk of
+                # files may already be using the same observation directory, so it
+                # is only removed once it is empty.
+                logging.info("Removing pipeline products in order to save disk space. \n")
+                for pipeline_files, obs_dir in processed_files:
+                    try:
+                        for file in pipeline_files:
+                            if os.path.isfile(file):
+                                os.remove(file)
+                        if os.path.exists(obs_dir) and len(os.listdir(obs_dir)) == 0:
+                            os.rmdir(obs_dir)
+                    except OSError as e:
+                        logging.error(f"Unable to delete {obs_dir}")
+                        logging.error(e)
+            except (StatementError, DataError, DatabaseError, InvalidRequestError, OperationalError) as e:
+                logging.error("Could not insert entries into database. \n")
+                logging.error(e)
+
+        if len(no_coord_files) > 0:
+            logging.error("{} files had no jump co-ordinates".format(len(no_coord_files)))
+            for file_name in no_coord_files:
+                logging.error("\t{} had no jump co-ordinates".format(file_name))
+
     def query_mast(self):
         """Use astroquery to search MAST for cosmic ray data
 
@@ -851,6 +1002,39 @@ class CosmicRay:
         return result
 
 
+def _analyze_file(aperture, nints, file_name, jump_file, rate_file):
+    """Measure the cosmic rays in one exposure. This is run in a worker
+    process by ``CosmicRay.process``.
+
+    Parameters
+    ----------
+    aperture : str
+        Name of the aperture used for the exposure
+
+    nints : int
+        Number of integrations in the exposure
+
+    file_name : str
+        Name of the uncal file
+
+    jump_file : str
+        Name of the jump step output file
+
+    rate_file : str
+        Name of the ramp fitting step output file
+
+    Returns
+    -------
+    cosmic_ray_db_entry : dict or None
+        Stats table entry for the exposure, from ``CosmicRay.analyze_file``
+    """
+    monitor = CosmicRay()
+    monitor.aperture = aperture
+    monitor.nints = nints
+
+    return monitor.analyze_file(file_name, jump_file, rate_file)
+
+
 if __name__ == '__main__':
     # Configure logging
     module = os.path.basename(__file__).strip('.py')
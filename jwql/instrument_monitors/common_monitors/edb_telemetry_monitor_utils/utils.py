@@ -121,5 +121,4 @@ def remove_outer_points(telemetry):
     telemetry : jwql.edb.engineering_database.EDBMnemonic
         EDBMnemonic object with first and last points removed
     """
-    telemetry.data.remove_row(0)
-    telemetry.data.remove_row(-1)
+    telemetry.data = telemetry.data[1:-1]
@@ -17,6 +17,8 @@
         pytest -s test_cosmic_ray_monitor.py
     """
 
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 import os
 
 from astropy.io import fits
@@ -25,6 +27,7 @@ import pytest
 
 from jwql.instrument_monitors.common_monitors.cosmic_ray_monitor import CosmicRay
 from jwql.database.database_interface import MIRICosmicRayQueryHistory
+from jwql.database.database_interface import MIRICosmicRayStats
 from jwql.utils.utils import get_config
 
 ON_GITHUB_ACTIONS = '/home/runner' in os.path.expanduser('~') or '/Users/runner' in os.path.expanduser('~')
@@ -126,15 +129,41 @@ def test_group_before():
 
     cr = CosmicRay()
 
-    jump_locations = [(2, 1, 1)]
+    jump_locations = np.array([(2, 1, 1)])
     cr.nints = 1
 
-    assert cr.group_before(jump_locations) == [(1, 1, 1)]
+    assert np.all(cr.group_before(jump_locations) == np.array([(1, 1, 1)]))
 
-    jump_locations = [(1, 2, 1, 1)]
+    jump_locations = np.array([(1, 2, 1, 1)])
     cr.nints = 2
 
-    assert cr.group_before(jump_locations) == [(1, 1, 1, 1)]
+    assert np.all(cr.group_before(jump_locations) == np.array([(1, 1, 1, 1)]))
+
+
+def test_get_jump_locs():
+    """Test the ``get_jump_locs`` function"""
+
+    cr = CosmicRay()
+    dq = np.zeros((2, 5, 10, 10), dtype=np.uint32)
+    dq[0, 3, 4, 4] = 4
+    dq[1, 2, 2, 2] = 4 + 1
+    dq[1, 1, 1, 1] = 1
+
+    jump_locs = cr.get_jump_locs(dq)
+    assert np.all(jump_locs == np.array([(0, 3, 4, 4), (1, 2, 2, 2)]))
+
+    assert cr.get_jump_locs(np.zeros((5, 10, 10), dtype=np.uint32)).shape == (0, 3)
+
+
+def test_identify_tables():
+    """Test the ``identify_tables`` function"""
+
+    cr = CosmicRay()
+    cr.instrument = 'miri'
+    cr.identify_tables()
+
+    assert cr.query_table == MIRICosmicRayQueryHistory
+    assert cr.stats_table.__tablename__ == 'miri_cosmic_ray_stats'
 
 
 @pytest.mark.skipif(ON_GITHUB_ACTIONS, reason='Requires access to central storage.')
@@ -170,6 +199,22 @@ def test_magnitude_fake_data():
     assert mag == 10.
 
 
+def test_magnitude_batch_fake_data():
+    """Test that the batch magnitude calculation matches the magnitude
+    method for each jump"""
+    data, rate, header, jump_coords, prior_coords = define_fake_test_data()
+
+    cr = CosmicRay()
+    cr.nints = 2
+    mags = cr.magnitude_batch(np.array(jump_coords), np.array(prior_coords), rate, data, header)
+    expected = [cr.magnitude(coord, coord_gb, rate, data, header) for coord, coord_gb in zip(jump_coords, prior_coords)]
+    assert np.all(mags == expected)
+    assert np.all(mags == [10, -5, 3])
+
+    # Without the prior coordinates, the group before each jump is found directly
+    assert np.all(cr.magnitude_batch(np.array(jump_coords), None, rate, data, header) == mags)
+
+
 def test_get_cr_mags_fake_data():
     """Test the calculation of multiple CR magnitudes"""
     data, rate, header, jump_coords, prior_coords = define_fake_test_data()
@@ -223,3 +268,31 @@ def test_query_mast():
     result = cr.query_mast()
 
     assert len(result) == 5
+
+
+def test_save_analyses(mocker, tmp_path):
+    """Test that files whose analysis failed are skipped, and the results
+    for the other files are still saved"""
+
+    cr = CosmicRay()
+    cr.stats_table = MIRICosmicRayStats
+    engine = mocker.patch('jwql.instrument_monitors.common_monitors.cosmic_ray_monitor.engine')
+
+    analyses = []
+    for i, outcome in enumerate([{'jump_count': 5}, BrokenProcessPool(), OSError(), None, {'jump_count': 0}]):
+        future = Future()
+        if isinstance(outcome, Exception):
+            future.set_exception(outcome)
+        else:
+            future.set_result(outcome)
+        pipeline_files = [str(tmp_path / f'file{i}_{suffix}.fits') for suffix in ['uncal', 'jump', 'rate']]
+        for file in pipeline_files:
+            open(file, 'w').close()
+        analyses.append((future, *pipeline_files, str(tmp_path)))
+
+    cr.save_analyses(analyses)
+
+    connection = engine.begin.return_value.__enter__.return_value
+    assert connection.execute.call_args[0][1] == [{'jump_count': 5}, {'jump_count': 0}]
+    assert sorted(os.listdir(tmp_path)) == sorted(f'file{i}_{suffix}.fits' for i in [1, 2, 3]
+                                                  for suffix in ['uncal', 'jump', 'rate'])
@@ -17,13 +17,16 @@ Use
 
         pytest -s test_edb.py
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
+import time
+from types import SimpleNamespace
 
+from astropy.io import ascii
+from astropy.stats import sigma_clipped_stats
 from astropy.table import Table
 from astropy.time import Time
 import astropy.units as u
-from datetime import datetime, timedelta
 import numpy as np
 import pytest
 
@@ -33,6 +36,40 @@ from jwql.edb import engineering_database as ed
 ON_GITHUB_ACTIONS = '/home/runner' in os.path.expanduser('~') or '/Users/runner' in os.path.expanduser('~')
 
 
+@pytest.fixture(autouse=True)
+def clear_mnemonic_cache():
+    """Make sure that no test gets query results cached by another test"""
+    ed.clear_mnemonic_cache()
+    yield
+    ed.clear_mnemonic_cache()
+
+
+def patch_engdb_service(mocker, values):
+    """Replace the EDB service with one returning the given all-points values,
+    one per minute starting at 2021-12-18 07:00:00.
+
+    Parameters
+    ----------
+    mocker : pytest_mock.MockerFixture
+        Mocker fixture of the calling test
+
+    values : list
+        Mnemonic values to return
+
+    Returns
+    -------
+    service : unittest.mock.MagicMock
+        Replacement service
+    """
+    rows = [SimpleNamespace(obstime=Time(datetime(2021, 12, 18, 7, n, 0)), value=value) for n, value in enumerate(values)]
+    service = mocker.MagicMock()
+    service.get_meta.return_value = {'TlmMnemonics': [{'AllPoints': 1}]}
+    service.get_values.return_value = rows
+    mocker.patch.object(ed, '_engdb_service', return_value=service)
+    mocker.patch.object(ed, 'get_mnemonic_info', return_value={})
+    return service
+
+
 def test_add():
     """Test addition (i.e. concatenation) of two EdbMnemonic objects"""
     dates1 = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(20, 30)])
@@ -63,6 +100,81 @@ def test_add():
     assert added.info['unit'] == 'V'
 
 
+def test_add_time_offset():
+    """Test that offsets in seconds are added to a datetime, for scalar and array offsets"""
+    epoch = datetime(2022, 3, 2, 12, 0, 0)
+    assert ed.add_time_offset(90.5, epoch) == datetime(2022, 3, 2, 12, 1, 30, 500000)
+
+    offsets = np.array([0., 1.0000015, 3600.])
+    expected = [epoch + timedelta(seconds=offset) for offset in offsets]
+    assert all(ed.add_time_offset(offsets, epoch) == expected)
+
+
+def test_block_stats():
+    """Test that statistics are calculated correctly for each block of data,
+    including blocks containing values that are sigma-clipped
+    """
+    dates = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(0, 30)])
+    data = np.concatenate((np.array([1., 2., 3., 4., 5., 6., 7., 8., 9., 10.]),
+                           np.array([5., 5., 5., 5., 5., 5., 5., 5., 5., 50.]),
+                           np.array([5., 5., 5., 5., 6., 6., 6., 6., 5., 6.])))
+    tab = Table()
+    tab["dates"] = dates
+    tab["euvalues"] = data
+    blocks = [0, 10, 20, 30]
+    mnemonic = ed.EdbMnemonic('SOMETHING', Time('2021-12-18T07:00:00'), Time('2021-12-18T07:30:00'), tab, {}, {},
+                              blocks=blocks)
+    mnemonic.meta = {'Count': 1,
+                     'TlmMnemonics': [{'TlmMnemonic': 'SOMETHING',
+                                       'AllPoints': 1}]}
+    mnemonic.block_stats(sigma=2)
+
+    for i in range(3):
+        block = data[blocks[i]:blocks[i + 1]]
+        expected_mean, expected_median, expected_dev = sigma_clipped_stats(block, sigma=2)
+        assert np.isclose(mnemonic.mean[i], expected_mean)
+        assert np.isclose(mnemonic.median[i], expected_median)
+        assert np.isclose(mnemonic.stdev[i], expected_dev)
+        assert mnemonic.max[i] == np.max(block)
+        assert mnemonic.min[i] == np.min(block)
+
+    # The outlier in the second block should have been clipped
+    assert mnemonic.mean[1] == 5.
+
+
+def test_calc_median_time():
+    """Test that the median time is halfway between the first and last times"""
+    times = np.array([datetime(2022, 3, 2, 12, 0, 0), datetime(2022, 3, 2, 12, 0, 7),
+                      datetime(2022, 3, 2, 12, 1, 1, 1)])
+    assert ed.calc_median_time(times) == times[0] + (times[-1] - times[0]) / 2.
+    assert ed.calc_median_time(times[0:1]) == times[0]
+    assert np.isnan(ed.calc_median_time([]))
+
+
+def test_change_only_add_points():
+    """Make sure that points are added immediately prior to each
+    point in a set of change-only data
+    """
+    dates = np.array([datetime(2022, 3, 2, 12, i) for i in range(4)])
+    values = np.array([1., 5., 2., 7.])
+    tab = Table()
+    tab["dates"] = dates
+    tab["euvalues"] = values
+    mnemonic = ed.EdbMnemonic('SOMETHING', Time('2022-03-02T12:00:00'), Time('2022-03-02T12:04:00'), tab, {}, {})
+    mnemonic.meta = {'Count': 1,
+                     'TlmMnemonics': [{'TlmMnemonic': 'SOMETHING',
+                                       'AllPoints': 0}]}
+    mnemonic.change_only_add_points()
+
+    delta_t = timedelta(microseconds=1)
+    expected_dates = [dates[0], dates[1] - delta_t, dates[1], dates[2] - delta_t, dates[2],
+                      dates[3] - delta_t, dates[3]]
+    expected_values = [1., 1., 5., 5., 2., 2., 7.]
+    assert all(mnemonic.data["dates"].data == expected_dates)
+    assert all(mnemonic.data["euvalues"].data == expected_values)
+    assert mnemonic.meta['TlmMnemonics'][0]['AllPoints'] == 1
+
+
 def test_change_only_bounding_points():
     """Make sure we correctly add starting and ending time entries to
     a set of change-only data
@@ -81,6 +193,64 @@ def test_change_only_bounding_points():
     assert np.all(new_values == expected_values)
 
 
+def test_change_only_stats():
+    """Test the time-weighted statistics of change-only data"""
+    dates = np.array([datetime(2022, 3, 2, 12, 0, 0) + timedelta(seconds=n) for n in [0, 10, 40, 60]])
+    values = np.array([1., 3., 2., 5.])
+    meanval, medianval, stdevval, maxval, minval = ed.change_only_stats(dates, values)
+
+    # Values 1, 3, 2 are present for 10, 30, and 20 seconds. The final value gets negligible weight.
+    assert np.isclose(meanval, 7. / 3.)
+    assert medianval == 3.
+    assert np.isclose(stdevval, np.sqrt((10 * (4. / 3.) ** 2 + 30 * (2. / 3.) ** 2 + 20 * (1. / 3.) ** 2) / 60.))
+    assert maxval == 5.
+    assert minval == 1.
+
+
+def test_concat():
+    """Test concatenation of a list of EdbMnemonic objects"""
+    all_dates = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(20, 50)])
+    all_data = np.arange(30)
+    info = {'unit': 'V', 'tlmMnemonic': 'TEST_VOLTAGE'}
+
+    # Overlapping pieces of the full data set, given out of order
+    mnemonics = []
+    for start, end, blocks in [(18, 30, [0, 4, 12]), (0, 10, [0, 5, 10]), (8, 20, [0, 6, 12])]:
+        tab = Table()
+        tab["dates"] = all_dates[start:end]
+        tab["euvalues"] = all_data[start:end]
+        mnemonics.append(ed.EdbMnemonic('TEST_VOLTAGE', Time('2021-12-18T07:20:00'), Time('2021-12-18T07:50:00'),
+                                        tab, {}, info, blocks=blocks))
+
+    combined = ed.EdbMnemonic.concat(mnemonics)
+    assert all(combined.data["dates"] == all_dates)
+    assert all(combined.data["euvalues"] == all_data)
+    assert all(combined.blocks == np.array([0, 5, 10, 14, 20, 22, 30]))
+    assert combined.info['unit'] == 'V'
+
+    added = mnemonics[1] + mnemonics[2] + mnemonics[0]
+    assert all(combined.data["dates"] == added.data["dates"])
+    assert all(combined.data["euvalues"] == added.data["euvalues"])
+    assert all(combined.blocks == added.blocks)
+
+    pair = ed.EdbMnemonic.concat(mnemonics[1:])
+    added = mnemonics[1] + mnemonics[2]
+    assert all(pair.data["euvalues"] == added.data["euvalues"])
+    assert all(pair.blocks == added.blocks)
+    assert all(added.blocks == np.array([0, 5, 10, 14, 20]))
+
+
+def test_create_time_offset():
+    """Test the number of seconds between times and an epoch, for scalar and array inputs"""
+    epoch = datetime(2022, 3, 2, 12, 0, 0)
+    assert ed.create_time_offset(datetime(2022, 3, 2, 12, 1, 30, 500000), epoch) == 90.5
+    assert np.isclose(ed.create_time_offset(Time('2022-03-02T12:01:30.5'), Time(epoch)), 90.5)
+
+    times = [epoch + timedelta(seconds=n) for n in [0., 1.5, 3600.]]
+    assert all(ed.create_time_offset(np.array(times), epoch) == [0., 1.5, 3600.])
+    assert np.allclose(ed.create_time_offset(Time(times), Time(epoch)), [0., 1.5, 3600.])
+
+
 def test_daily_stats():
     """Test that the daily statistics are calculated correctly
     """
@@ -123,6 +293,34 @@ def test_full_stats():
     assert mnemonic.median_times[0] == datetime(2021, 12, 18, 7, 24, 30)
 
 
+def test_full_stats_deferred():
+    """Test that the full data statistics are calculated when first used,
+    and reflect the data present when the instance was created
+    """
+    dates = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(20, 30)])
+    tab = Table()
+    tab["dates"] = dates
+    tab["euvalues"] = np.arange(1, 11)
+    meta = {'TlmMnemonics': [{'TlmMnemonic': 'SOMETHING', 'AllPoints': 1}]}
+    mnemonic = ed.EdbMnemonic('SOMETHING', Time('2021-12-18T07:20:00'), Time('2021-12-18T07:30:00'), tab, meta, {})
+    assert mnemonic._stats_pending
+
+    # Replacing the data table should not change the statistics
+    new_tab = Table()
+    new_tab["dates"] = dates
+    new_tab["euvalues"] = np.arange(11, 21)
+    mnemonic.data = new_tab
+    assert not mnemonic._stats_pending
+    assert mnemonic.mean[0] == 5.5
+    assert mnemonic.median_times[0] == datetime(2021, 12, 18, 7, 24, 30)
+
+    # Block statistics replace the full data statistics without calculating them
+    mnemonic = ed.EdbMnemonic('SOMETHING', Time('2021-12-18T07:20:00'), Time('2021-12-18T07:30:00'), tab, meta, {},
+                              blocks=[0, 5, 10])
+    mnemonic.block_stats()
+    assert mnemonic.mean == [3., 8.]
+
+
 @pytest.mark.skipif(ON_GITHUB_ACTIONS, reason='Requires access to central storage.')
 def test_get_mnemonic():
     """Test the query of a single mnemonic."""
@@ -150,6 +348,45 @@ def test_get_mnemonic():
                              'longDescription': None}
 
 
+def test_get_mnemonic_cache(mocker):
+    """Test that repeated queries return deep copies of a cached result until
+    the result expires
+    """
+    service = patch_engdb_service(mocker, [1., 2., 3.])
+    monotonic = mocker.patch.object(ed.time, 'monotonic', return_value=1000.)
+    start_time = Time('2021-12-18T07:00:00')
+    end_time = Time('2021-12-18T07:10:00')
+
+    first = ed.get_mnemonic('SOMETHING', start_time, end_time)
+    first.data["euvalues"][0] = 100.
+
+    monotonic.return_value = 1000. + ed.MNEMONIC_CACHE_TTL - 1
+    second = ed.get_mnemonic('SOMETHING', start_time, end_time)
+    assert service.get_values.call_count == 1
+    assert second is not first
+    assert all(second.data["euvalues"] == [1., 2., 3.])
+
+    # Expired results are queried again
+    monotonic.return_value = 1000. + ed.MNEMONIC_CACHE_TTL + 1
+    ed.get_mnemonic('SOMETHING', start_time, end_time)
+    assert service.get_values.call_count == 2
+
+
+def test_get_mnemonic_dtypes(mocker):
+    """Test that integer-valued mnemonic values and their statistics are returned
+    as float64, which can be inserted into the database
+    """
+    patch_engdb_service(mocker, [float(n % 3) for n in range(10)])
+
+    mnemonic = ed.get_mnemonic('SOMETHING', Time('2021-12-18T07:00:00'), Time('2021-12-18T07:10:00'))
+    assert mnemonic.data["euvalues"].dtype == np.float64
+
+    mnemonic.full_stats()
+    assert isinstance(mnemonic.max[0], float)
+    assert isinstance(mnemonic.min[0], float)
+    assert mnemonic.max[0] == 2.
+
+
 @pytest.mark.skipif(ON_GITHUB_ACTIONS, reason='Requires access to central storage.')
 def test_get_mnemonics():
     """Test the query of a list of mnemonics."""
@@ -163,6 +400,21 @@ def test_get_mnemonics():
     assert len(mnemonic_dict) == len(mnemonics)
 
 
+def test_get_mnemonics_order(mocker):
+    """Test that concurrent queries of a list of mnemonics are returned
+    in the requested order"""
+    def fake_get_mnemonic(mnemonic_identifier, start_time, end_time):
+        # Finish the queries in the reverse of the requested order
+        time.sleep(0.01 * (5 - int(mnemonic_identifier[-1])))
+        return mnemonic_identifier
+
+    mocker.patch.object(ed, 'get_mnemonic', side_effect=fake_get_mnemonic)
+    mnemonics = [f'MNEMONIC{i}' for i in range(5)]
+    mnemonic_dict = ed.get_mnemonics(mnemonics, Time('2022-01-01'), Time('2022-01-02'))
+    assert list(mnemonic_dict.keys()) == mnemonics
+    assert list(mnemonic_dict.values()) == mnemonics
+
+
 @pytest.mark.skipif(ON_GITHUB_ACTIONS, reason='Requires access to central storage.')
 def test_get_mnemonic_info():
     """Test retrieval of mnemonic info."""
@@ -179,6 +431,35 @@ def test_get_mnemonic_info():
                     'longDescription': None}
 
 
+def test_get_mnemonic_info_cache(mocker):
+    """Test that mnemonic info is only queried once per mnemonic, and that
+    changes to the returned info do not affect the cache"""
+    query = mocker.patch.object(ed, 'query_mnemonic_info', return_value={'unit': 'V', 'tlmMnemonic': 'TEST_CACHE'})
+    mocker.patch.object(ed, '_mast_token', return_value='token')
+    ed._mnemonic_info.cache_clear()
+    try:
+        info = ed.get_mnemonic_info('TEST_CACHE')
+        info['unit'] = 'A'
+        assert ed.get_mnemonic_info('TEST_CACHE') == {'unit': 'V', 'tlmMnemonic': 'TEST_CACHE'}
+        assert query.call_count == 1
+    finally:
+        ed._mnemonic_info.cache_clear()
+
+
+def test_interpolate_datetimes():
+    """Test interpolation of values between two sets of datetimes"""
+    old_times = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(20, 30)])
+    old_data = np.arange(10)
+    new_times = [datetime(2021, 12, 18, 7, 20, 30) + timedelta(minutes=n) for n in range(5)]
+    new_data = ed.interpolate_datetimes(new_times, old_times, old_data)
+    assert np.allclose(new_data, np.arange(5) + 0.5)
+
+    # datetime64 inputs give the same results
+    new_data = ed.interpolate_datetimes(np.array(new_times, dtype='datetime64[us]'),
+                                        old_times.astype('datetime64[us]'), old_data)
+    assert np.allclose(new_data, np.arange(5) + 0.5)
+
+
 def test_interpolation():
     """Test interpolation of an EdbMnemonic object"""
     dates = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(20, 30)])
@@ -229,6 +510,54 @@ def test_interpolation_change_only():
     assert all(mnemonic.blocks == expected_blocks)
 
 
+def test_is_valid_mnemonic(mocker):
+    """Test that mnemonic names are checked against the mnemonic inventory"""
+    inventory = Table({'tlmMnemonic': ['SA_ZFGOUTFOV', 'IMIR_HK_ICE_SEC_VOLT4']})
+    mocker.patch.object(ed, 'mnemonic_inventory', return_value=(inventory, {}))
+    ed._mnemonic_names.cache_clear()
+    try:
+        assert ed.is_valid_mnemonic('SA_ZFGOUTFOV')
+        assert not ed.is_valid_mnemonic('SA_ZFGOUT')
+    finally:
+        ed._mnemonic_names.cache_clear()
+
+
+def test_mnemonic_cache():
+    """Test that EdbMnemonic instances are cached and expire correctly"""
+    dates = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(20, 30)])
+    tab = Table()
+    tab["dates"] = dates
+    tab["euvalues"] = np.arange(10)
+    mnemonic = ed.EdbMnemonic('SOMETHING', Time('2021-12-18T07:20:00'), Time('2021-12-18T07:30:00'), tab, {}, {})
+    key = ('SOMETHING', '2021-12-18T07:20:00.000', '2021-12-18T07:30:00.000')
+
+    ed._cache_mnemonic(key, mnemonic)
+    cached = ed._get_cached_mnemonic(key)
+    assert cached is not mnemonic
+    assert all(cached.data["euvalues"] == mnemonic.data["euvalues"])
+
+    # The column views of the copy must refer to the copied table
+    assert np.shares_memory(cached._vals_arr, cached.data["euvalues"])
+    assert np.shares_memory(cached._dates_arr, cached.data["dates"])
+    assert not np.shares_memory(cached._vals_arr, mnemonic.data["euvalues"])
+    cached.data["euvalues"][0] = 100
+    assert cached._vals_arr[0] == 100
+    assert mnemonic._vals_arr[0] == 0
+    assert len(cached.dates_dt64) == 10
+
+    # Changes to the returned instance must not affect the cache
+    cached.data = cached.data[0:2]
+    assert len(ed._get_cached_mnemonic(key)) == 10
+
+    # Expired entries are not returned
+    ttl = ed.MNEMONIC_CACHE_TTL
+    try:
+        ed.MNEMONIC_CACHE_TTL = -1
+        assert ed._get_cached_mnemonic(key) is None
+    finally:
+        ed.MNEMONIC_CACHE_TTL = ttl
+
+
 def test_multiplication():
     """Test multiplication of two EdbMnemonic objects"""
     dates1 = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(20, 30)])
@@ -271,6 +600,21 @@ def test_multiplication():
     assert prod.info['tlmMnemonic'] == 'TEST_VOLTAGE * TEST_CURRENT'
 
 
+def test_save_table(tmp_path):
+    """Test that the dates and values are written to a text file"""
+    dates = np.array([datetime(2021, 12, 18, 7, n, 0) for n in range(20, 25)])
+    tab = Table()
+    tab["dates"] = dates
+    tab["euvalues"] = np.arange(5) * 1.5
+    mnemonic = ed.EdbMnemonic('SOMETHING', Time('2021-12-18T07:20:00'), Time('2021-12-18T07:25:00'), tab, {}, {})
+
+    outname = tmp_path / 'mnemonic.txt'
+    mnemonic.save_table(str(outname))
+    saved = ascii.read(str(outname), format='basic')
+    assert list(saved["dates"]) == [f'2021-12-18T07:{n}:00.000000' for n in range(20, 25)]
+    assert np.all(saved["euvalues"] == np.arange(5) * 1.5)
+
+
 def test_timed_stats():
     """Break up data into chunks of a given duration"""
     dates = np.array([datetime(2021, 12, 18, 12, 0, 0) + timedelta(hours=n) for n in range(0, 75, 2)])
@@ -289,3 +633,38 @@ def test_timed_stats():
     mnemonic.mean_time_block = duration
     mnemonic.timed_stats(sigma=3)
     assert np.all(np.isclose(mnemonic.mean, np.append(np.arange(1.05, 6.06, 1), 96.)))
+
+
+def test_timed_stats_after_row_removal():
+    """Test that statistics and interpolation use the current data after rows
+    are removed from the data table in place"""
+    tab = Table()
+    tab["dates"] = np.array([datetime(2021, 12, 18) + timedelta(hours=6 * n) for n in range(6)])
+    tab["euvalues"] = np.arange(1., 7.)
+    mnemonic = ed.EdbMnemonic('SOMETHING', Time('2021-12-18T00:00:00'), Time('2021-12-19T06:00:00'), tab,
+                              {'TlmMnemonics': [{'AllPoints': 1}]}, {})
+    mnemonic.data.remove_row(0)
+    mnemonic.data.remove_row(-1)
+    assert mnemonic.data_start_time == datetime(2021, 12, 18, 6)
+    assert len(mnemonic.dates_dt64) == 4
+
+    mnemonic.mean_time_block = 12 * u.hour
+    mnemonic.timed_stats()
+    assert np.all(np.isclose(mnemonic.mean, [2.5, 4.5]))
+
+    mnemonic.interpolate([datetime(2021, 12, 18, 12), datetime(2021, 12, 18, 15)])
+    assert np.all(np.isclose(mnemonic.data["euvalues"], [3., 3.5]))
+
+
+def test_timed_stats_no_bins():
+    """Test that timed_stats gives empty results when there are too few data to bin"""
+    for num_points in [0, 1]:
+        tab = Table()
+        tab["dates"] = np.array([datetime(2021, 12, 18, 12, 0, 0)] * num_points)
+        tab["euvalues"] = np.ones(num_points)
+        mnemonic = ed.EdbMnemonic('SOMETHING', Time('2021-12-18T02:00:00'), Time('2021-12-21T14:00:00'), tab,
+                                  {'TlmMnemonics': [{'AllPoints': 1}]}, {})
+        mnemonic.mean_time_block = 12 * u.hour
+        mnemonic.timed_stats()
+        assert len(mnemonic.mean) == 0
+        assert len(mnemonic.median_times) == 0
@@ -413,6 +413,16 @@ def test_get_config():
     assert isinstance(settings, dict)
 
 
+@pytest.mark.skipif(ON_GITHUB_ACTIONS, reason='Requires access to central storage.')
+def test_get_config_cached_copy():
+    """Assert that changing the dictionary returned by ``get_config``
+    does not change the cached settings.
+    """
+    settings = get_config()
+    settings['filesystem'] = None
+    assert get_config()['filesystem'] is not None
+
+
 @pytest.mark.parametrize('filename, solution', FILENAME_PARSER_TEST_DATA)
 def test_filename_parser(filename, solution):
     """Generate a dictionary with parameters from a JWST filename.
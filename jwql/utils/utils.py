@@ -27,6 +27,8 @@ References
     - JWST TR JWST-STScI-004800, SM-12
  """
 
+import copy
+from functools import lru_cache
 import getpass
 import glob
 import itertools
@@ -59,6 +61,226 @@ __location__ = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 ON_GITHUB_ACTIONS = '/home/runner' in os.path.expanduser('~') or '/Users/runner' in os.path.expanduser('~')
 
 
+def _compile_filename_patterns():
+    """Build the compiled regular expressions used by
+    ``filename_parser`` for each JWST filename type
+
+    Returns
+    -------
+    filename_patterns : list
+        ``(filename_type_name, suffix_pattern, root_pattern)`` tuples, in
+        the order in which they are tried. ``suffix_pattern`` matches a
+        full filename ending in a standard suffix, while ``root_pattern``
+        must match the entire filename root.
+    """
+
+    # Stage 1 and 2 filenames
+    # e.g. "jw80500012009_01101_00012_nrcalong_uncal.fits"
+    stage_1_and_2 = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
+        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})"\
+        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})"\
+        r"_(?P<visit_group>\d{" + f"{FILE_VISIT_GRP_LEN}" + "})"\
+        r"(?P<parallel_seq_id>\d{" + f"{FILE_PARALLEL_SEQ_ID_LEN}" + "})"\
+        r"(?P<activity>\w{" f"{FILE_ACT_LEN}" + "})"\
+        r"_(?P<exposure_id>\d+)"\
+        r"_(?P<detector>((?!_)[\w])+)"
+
+    # Stage 2c outlier detection filenames
+    # e.g. "jw94015002002_02108_00001_mirimage_o002_crf.fits"
+    stage_2c = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})" \
+        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})" \
+        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})" \
+        r"_(?P<visit_group>\d{" + f"{FILE_VISIT_GRP_LEN}" + "})" \
+        r"(?P<parallel_seq_id>\d{" + f"{FILE_PARALLEL_SEQ_ID_LEN}" + "})" \
+        r"(?P<activity>\w{" + f"{FILE_ACT_LEN}" + "})" \
+        r"_(?P<exposure_id>\d+)" \
+        r"_(?P<detector>((?!_)[\w])+)"\
+        r"_(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"
+
+    # Stage 2 MSA metadata file. Created by APT and loaded in
+    # assign_wcs. e.g. "jw01118008001_01_msa.fits"
+    stage_2_msa = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
+        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})"\
+        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})"\
+        r"(_.._msa.fits)"
+
+    # Stage 3 filenames with target ID
+    # e.g. "jw80600-o009_t001_miri_f1130w_i2d.fits"
+    stage_3_target_id = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
+        r"-(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"\
+        r"_(?P<target_id>(t)\d{" + f"{FILE_TARG_ID_LEN}" + "})"\
+        r"_(?P<instrument>(nircam|niriss|nirspec|miri|fgs))"\
+        r"_(?P<optical_elements>((?!_)[\w-])+)"
+
+    # Stage 3 filenames with source ID
+    # e.g. "jw80600-o009_s00001_miri_f1130w_i2d.fits"
+    stage_3_source_id = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
+        r"-(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"\
+        r"_(?P<source_id>(s)\d{" + f"{FILE_SOURCE_ID_LEN}" + "})"\
+        r"_(?P<instrument>(nircam|niriss|nirspec|miri|fgs))"\
+        r"_(?P<optical_elements>((?!_)[\w-])+)"
+
+    # Stage 3 filenames with target ID and epoch
+    # e.g. "jw80600-o009_t001-epoch1_miri_f1130w_i2d.fits"
+    stage_3_target_id_epoch = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
+        r"-(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"\
+        r"_(?P<target_id>(t)\d{" + f"{FILE_TARG_ID_LEN}" + "})"\
+        r"-epoch(?P<epoch>\d{" + f"{FILE_EPOCH_LEN}" + "})"\
+        r"_(?P<instrument>(nircam|niriss|nirspec|miri|fgs))"\
+        r"_(?P<optical_elements>((?!_)[\w-])+)"
+
+    # Stage 3 filenames with source ID and epoch
+    # e.g. "jw80600-o009_s00001-epoch1_miri_f1130w_i2d.fits"
+    stage_3_source_id_epoch = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
+        r"-(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"\
+        r"_(?P<source_id>(s)\d{" + f"{FILE_SOURCE_ID_LEN}" + "})"\
+        r"-epoch(?P<epoch>\d{" + f"{FILE_EPOCH_LEN}" + "})"\
+        r"_(?P<instrument>(nircam|niriss|nirspec|miri|fgs))"\
+        r"_(?P<optical_elements>((?!_)[\w-])+)"
+
+    # Time series filenames
+    # e.g. "jw00733003001_02101_00002-seg001_nrs1_rate.fits"
+    time_series = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
+        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})"\
+        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})"\
+        r"_(?P<visit_group>\d{" + f"{FILE_VISIT_GRP_LEN}" + "})"\
+        r"(?P<parallel_seq_id>\d{" + f"{FILE_PARALLEL_SEQ_ID_LEN}" + "})"\
+        r"(?P<activity>\w{" + f"{FILE_ACT_LEN}" + "})"\
+        r"_(?P<exposure_id>\d+)"\
+        r"-seg(?P<segment>\d{" + f"{FILE_SEG_LEN}" + "})"\
+        r"_(?P<detector>((?!_)[\w])+)"
+
+    # Time series filenames for stage 2c
+    # e.g. "jw00733003001_02101_00002-seg001_nrs1_o001_crfints.fits"
+    time_series_2c = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
+        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})"\
+        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})"\
+        r"_(?P<visit_group>\d{" + f"{FILE_VISIT_GRP_LEN}" + "})"\
+        r"(?P<parallel_seq_id>\d{" + f"{FILE_PARALLEL_SEQ_ID_LEN}" + "})"\
+        r"(?P<activity>\w{" + f"{FILE_ACT_LEN}" + "})"\
+        r"_(?P<exposure_id>\d+)"\
+        r"-seg(?P<segment>\d{" + f"{FILE_SEG_LEN}" + "})"\
+        r"_(?P<detector>((?!_)[\w])+)"\
+        r"_(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"
+
+    # Guider filenames
+    # e.g. "jw00729011001_gs-id_1_image_cal.fits" or
+    # "jw00799003001_gs-acq1_2019154181705_stream.fits"
+    guider = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})" \
+        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})" \
+        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})" \
+        r"_gs-(?P<guider_mode>(id|acq1|acq2|track|fg))" \
+        r"_((?P<date_time>\d{" + f"{FILE_DATETIME_LEN}" + r"})|(?P<guide_star_attempt_id>\d{" + f"{FILE_GUIDESTAR_ATTMPT_LEN_MIN},{FILE_GUIDESTAR_ATTMPT_LEN_MAX}" + "}))"
+
+    # Segment guider filenames
+    # e.g. "jw01118005001_gs-fg_2022150070312-seg002_uncal.fits"
+    guider_segment = \
+        r"jw" \
+        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})" \
+        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})" \
+        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})" \
+        r"_gs-(?P<guider_mode>(id|acq1|acq2|track|fg))" \
+        r"_((?P<date_time>\d{" + f"{FILE_DATETIME_LEN}" + r"})|(?P<guide_star_attempt_id>\d{" + f"{FILE_GUIDESTAR_ATTMPT_LEN_MIN},{FILE_GUIDESTAR_ATTMPT_LEN_MAX}" + "}))" \
+        r"-seg(?P<segment>\d{" + f"{FILE_SEG_LEN}" + "})"
+
+    # Build list of filename types
+    filename_types = [
+        stage_1_and_2,
+        stage_2c,
+        stage_2_msa,
+        stage_3_target_id,
+        stage_3_source_id,
+        stage_3_target_id_epoch,
+        stage_3_source_id_epoch,
+        time_series,
+        time_series_2c,
+        guider,
+        guider_segment]
+
+    filename_type_names = [
+        'stage_1_and_2',
+        'stage_2c',
+        'stage_2_msa',
+        'stage_3_target_id',
+        'stage_3_source_id',
+        'stage_3_target_id_epoch',
+        'stage_3_source_id_epoch',
+        'time_series',
+        'time_series_2c',
+        'guider',
+        'guider_segment'
+    ]
+
+    suffix = r"_(?P<suffix>{}).*".format('|'.join(FILE_SUFFIX_TYPES))
+    filename_patterns = [(filename_type_name, re.compile(filename_type + suffix), re.compile(filename_type + r"$"))
+                         for filename_type, filename_type_name in zip(filename_types, filename_type_names)]
+
+    return filename_patterns
+
+
+# Compiled filename regular expressions, built once at import
+_FILENAME_PATTERNS = _compile_filename_patterns()
+
+
+@lru_cache()
+def _load_config(config_file_location):
+    """Read and validate the ``jwql`` config file. The result is cached,
+    so the file is only read once per process.
+
+    Parameters
+    ----------
+    config_file_location : str
+        Path to the config file
+
+    Returns
+    -------
+    settings : dict
+        A dictionary that holds the contents of the config file.
+    """
+    # Make sure the file exists
+    if not os.path.isfile(config_file_location):
+        base_config = os.path.basename(config_file_location)
+        raise FileNotFoundError('The JWQL package requires a configuration file ({}) '
+                                'to be placed within the main jwql directory. '
+                                'This file is missing. Please read the relevant wiki page '
+                                '(https://github.com/spacetelescope/jwql/wiki/'
+                                'Config-file) for more information.'.format(base_config))
+
+    with open(config_file_location, 'r') as config_file_object:
+        try:
+            # Load it with JSON
+            settings = json.load(config_file_object)
+        except json.JSONDecodeError as e:
+            # Raise a more helpful error if there is a formatting problem
+            raise ValueError('Incorrectly formatted config.json file. '
+                             'Please fix JSON formatting: {}'.format(e))
+
+    # Ensure the file has all the needed entries with expected data types
+    _validate_config(settings)
+
+    return settings
+
+
 def _validate_config(config_file_dict):
     """Check that the config.json file contains all the needed entries with
     expected data types
@@ -193,28 +415,8 @@ def get_config():
         # Users should complete their own configuration file and store it in the main jwql directory
         config_file_location = os.path.join(__location__, 'jwql', 'config.json')
 
-    # Make sure the file exists
-    if not os.path.isfile(config_file_location):
-        base_config = os.path.basename(config_file_location)
-        raise FileNotFoundError('The JWQL package requires a configuration file ({}) '
-                                'to be placed within the main jwql directory. '
-                                'This file is missing. Please read the relevant wiki page '
-                                '(https://github.com/spacetelescope/jwql/wiki/'
-                                'Config-file) for more information.'.format(base_config))
-
-    with open(config_file_location, 'r') as config_file_object:
-        try:
-            # Load it with JSON
-            settings = json.load(config_file_object)
-        except json.JSONDecodeError as e:
-            # Raise a more helpful error if there is a formatting problem
-            raise ValueError('Incorrectly formatted config.json file. '
-                             'Please fix JSON formatting: {}'.format(e))
-
-    # Ensure the file has all the needed entries with expected data types
-    _validate_config(settings)
-
-    return settings
+    # Return a copy so that callers cannot modify the cached settings
+    return copy.deepcopy(_load_config(config_file_location))
 
 
 if not ON_GITHUB_ACTIONS:
@@ -346,174 +548,13 @@ def filename_parser(filename):
     else:
         root_name = split_filename[0]
 
-    # Stage 1 and 2 filenames
-    # e.g. "jw80500012009_01101_00012_nrcalong_uncal.fits"
-    stage_1_and_2 = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
-        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})"\
-        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})"\
-        r"_(?P<visit_group>\d{" + f"{FILE_VISIT_GRP_LEN}" + "})"\
-        r"(?P<parallel_seq_id>\d{" + f"{FILE_PARALLEL_SEQ_ID_LEN}" + "})"\
-        r"(?P<activity>\w{" f"{FILE_ACT_LEN}" + "})"\
-        r"_(?P<exposure_id>\d+)"\
-        r"_(?P<detector>((?!_)[\w])+)"
-
-    # Stage 2c outlier detection filenames
-    # e.g. "jw94015002002_02108_00001_mirimage_o002_crf.fits"
-    stage_2c = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})" \
-        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})" \
-        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})" \
-        r"_(?P<visit_group>\d{" + f"{FILE_VISIT_GRP_LEN}" + "})" \
-        r"(?P<parallel_seq_id>\d{" + f"{FILE_PARALLEL_SEQ_ID_LEN}" + "})" \
-        r"(?P<activity>\w{" + f"{FILE_ACT_LEN}" + "})" \
-        r"_(?P<exposure_id>\d+)" \
-        r"_(?P<detector>((?!_)[\w])+)"\
-        r"_(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"
-
-    # Stage 2 MSA metadata file. Created by APT and loaded in
-    # assign_wcs. e.g. "jw01118008001_01_msa.fits"
-    stage_2_msa = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
-        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})"\
-        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})"\
-        r"(_.._msa.fits)"
-
-    # Stage 3 filenames with target ID
-    # e.g. "jw80600-o009_t001_miri_f1130w_i2d.fits"
-    stage_3_target_id = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
-        r"-(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"\
-        r"_(?P<target_id>(t)\d{" + f"{FILE_TARG_ID_LEN}" + "})"\
-        r"_(?P<instrument>(nircam|niriss|nirspec|miri|fgs))"\
-        r"_(?P<optical_elements>((?!_)[\w-])+)"
-
-    # Stage 3 filenames with source ID
-    # e.g. "jw80600-o009_s00001_miri_f1130w_i2d.fits"
-    stage_3_source_id = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
-        r"-(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"\
-        r"_(?P<source_id>(s)\d{" + f"{FILE_SOURCE_ID_LEN}" + "})"\
-        r"_(?P<instrument>(nircam|niriss|nirspec|miri|fgs))"\
-        r"_(?P<optical_elements>((?!_)[\w-])+)"
-
-    # Stage 3 filenames with target ID and epoch
-    # e.g. "jw80600-o009_t001-epoch1_miri_f1130w_i2d.fits"
-    stage_3_target_id_epoch = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
-        r"-(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"\
-        r"_(?P<target_id>(t)\d{" + f"{FILE_TARG_ID_LEN}" + "})"\
-        r"-epoch(?P<epoch>\d{" + f"{FILE_EPOCH_LEN}" + "})"\
-        r"_(?P<instrument>(nircam|niriss|nirspec|miri|fgs))"\
-        r"_(?P<optical_elements>((?!_)[\w-])+)"
-
-    # Stage 3 filenames with source ID and epoch
-    # e.g. "jw80600-o009_s00001-epoch1_miri_f1130w_i2d.fits"
-    stage_3_source_id_epoch = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
-        r"-(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"\
-        r"_(?P<source_id>(s)\d{" + f"{FILE_SOURCE_ID_LEN}" + "})"\
-        r"-epoch(?P<epoch>\d{" + f"{FILE_EPOCH_LEN}" + "})"\
-        r"_(?P<instrument>(nircam|niriss|nirspec|miri|fgs))"\
-        r"_(?P<optical_elements>((?!_)[\w-])+)"
-
-    # Time series filenames
-    # e.g. "jw00733003001_02101_00002-seg001_nrs1_rate.fits"
-    time_series = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
-        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})"\
-        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})"\
-        r"_(?P<visit_group>\d{" + f"{FILE_VISIT_GRP_LEN}" + "})"\
-        r"(?P<parallel_seq_id>\d{" + f"{FILE_PARALLEL_SEQ_ID_LEN}" + "})"\
-        r"(?P<activity>\w{" + f"{FILE_ACT_LEN}" + "})"\
-        r"_(?P<exposure_id>\d+)"\
-        r"-seg(?P<segment>\d{" + f"{FILE_SEG_LEN}" + "})"\
-        r"_(?P<detector>((?!_)[\w])+)"
-
-    # Time series filenames for stage 2c
-    # e.g. "jw00733003001_02101_00002-seg001_nrs1_o001_crfints.fits"
-    time_series_2c = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})"\
-        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})"\
-        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})"\
-        r"_(?P<visit_group>\d{" + f"{FILE_VISIT_GRP_LEN}" + "})"\
-        r"(?P<parallel_seq_id>\d{" + f"{FILE_PARALLEL_SEQ_ID_LEN}" + "})"\
-        r"(?P<activity>\w{" + f"{FILE_ACT_LEN}" + "})"\
-        r"_(?P<exposure_id>\d+)"\
-        r"-seg(?P<segment>\d{" + f"{FILE_SEG_LEN}" + "})"\
-        r"_(?P<detector>((?!_)[\w])+)"\
-        r"_(?P<ac_id>(o\d{" + f"{FILE_AC_O_ID_LEN}" + r"}|(c|a|r)\d{" + f"{FILE_AC_CAR_ID_LEN}" + "}))"
-
-    # Guider filenames
-    # e.g. "jw00729011001_gs-id_1_image_cal.fits" or
-    # "jw00799003001_gs-acq1_2019154181705_stream.fits"
-    guider = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})" \
-        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})" \
-        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})" \
-        r"_gs-(?P<guider_mode>(id|acq1|acq2|track|fg))" \
-        r"_((?P<date_time>\d{" + f"{FILE_DATETIME_LEN}" + r"})|(?P<guide_star_attempt_id>\d{" + f"{FILE_GUIDESTAR_ATTMPT_LEN_MIN},{FILE_GUIDESTAR_ATTMPT_LEN_MAX}" + "}))"
-
-    # Segment guider filenames
-    # e.g. "jw01118005001_gs-fg_2022150070312-seg002_uncal.fits"
-    guider_segment = \
-        r"jw" \
-        r"(?P<program_id>\d{" + f"{FILE_PROG_ID_LEN}" + "})" \
-        r"(?P<observation>\d{" + f"{FILE_OBS_LEN}" + "})" \
-        r"(?P<visit>\d{" + f"{FILE_VISIT_LEN}" + "})" \
-        r"_gs-(?P<guider_mode>(id|acq1|acq2|track|fg))" \
-        r"_((?P<date_time>\d{" + f"{FILE_DATETIME_LEN}" + r"})|(?P<guide_star_attempt_id>\d{" + f"{FILE_GUIDESTAR_ATTMPT_LEN_MIN},{FILE_GUIDESTAR_ATTMPT_LEN_MAX}" + "}))" \
-        r"-seg(?P<segment>\d{" + f"{FILE_SEG_LEN}" + "})"
-
-    # Build list of filename types
-    filename_types = [
-        stage_1_and_2,
-        stage_2c,
-        stage_2_msa,
-        stage_3_target_id,
-        stage_3_source_id,
-        stage_3_target_id_epoch,
-        stage_3_source_id_epoch,
-        time_series,
-        time_series_2c,
-        guider,
-        guider_segment]
-
-    filename_type_names = [
-        'stage_1_and_2',
-        'stage_2c',
-        'stage_2_msa',
-        'stage_3_target_id',
-        'stage_3_source_id',
-        'stage_3_target_id_epoch',
-        'stage_3_source_id_epoch',
-        'time_series',
-        'time_series_2c',
-        'guider',
-        'guider_segment'
-    ]
-
     # Try to parse the filename
-    for filename_type, filename_type_name in zip(filename_types, filename_type_names):
-
-        # If full filename, try using suffix, except for *msa.fits files
-        if not file_root_name and FILETYPE_WO_STANDARD_SUFFIX not in filename:
-            filename_type += r"_(?P<suffix>{}).*".format('|'.join(FILE_SUFFIX_TYPES))
-        # If not, make sure the provided regex matches the entire filename root
-        else:
-            filename_type += r"$"
+    use_suffix = not file_root_name and FILETYPE_WO_STANDARD_SUFFIX not in filename
+    for filename_type_name, suffix_pattern, root_pattern in _FILENAME_PATTERNS:
 
-        elements = re.compile(filename_type)
+        # If full filename, try using suffix, except for *msa.fits files.
+        # If not, make sure the regex matches the entire filename root
+        elements = suffix_pattern if use_suffix else root_pattern
         jwst_file = elements.match(filename)
 
         # Stop when you find a format that matches
@@ -540,14 +581,14 @@ def filename_parser(filename):
                 filename_dict['instrument'] = 'nirspec'
 
         # Also add detector, root name, and group root name
-        root_name = re.sub(rf"_{filename_dict.get('suffix', '')}$", '', root_name)
-        root_name = re.sub(rf"_{filename_dict.get('ac_id', '')}$", '', root_name)
+        root_name = root_name.removesuffix(f"_{filename_dict.get('suffix', '')}")
+        root_name = root_name.removesuffix(f"_{filename_dict.get('ac_id', '')}")
         filename_dict['file_root'] = root_name
         if 'detector' not in filename_dict.keys():
             filename_dict['detector'] = 'Unknown'
             filename_dict['group_root'] = root_name
         else:
-            group_root = re.sub(rf"_{filename_dict['detector']}$", '', root_name)
+            group_root = root_name.removesuffix(f"_{filename_dict['detector']}")
             filename_dict['group_root'] = group_root
 
     # Raise error if unable to parse the filename
@@ -24,6 +24,7 @@ import os
 
 from bokeh.embed import components
 from bokeh.layouts import layout
+from bokeh.models import Span
 from bokeh.models.widgets import Tabs, Panel
 from bokeh.plotting import figure, output_file
 import numpy as np
@@ -69,22 +70,22 @@ def add_limit_boxes(fig, yellow=None, red=None):
             fig.add_layout(yellow_high)
             yellow_low = BoxAnnotation(bottom=red_limits[0], top=yellow_limits[0], fill_color='gold', fill_alpha=0.2)
             fig.add_layout(yellow_low)
-            red_high = BoxAnnotation(bottom=red_limits[1], top=red_limits[1] + 100, fill_color='red', fill_alpha=0.1)
+            red_high = BoxAnnotation(bottom=red_limits[1], fill_color='red', fill_alpha=0.1)
             fig.add_layout(red_high)
-            red_low = BoxAnnotation(bottom=red_limits[0] - 100, top=red_limits[0], fill_color='red', fill_alpha=0.1)
+            red_low = BoxAnnotation(top=red_limits[0], fill_color='red', fill_alpha=0.1)
             fig.add_layout(red_low)
         else:
-            yellow_high = BoxAnnotation(bottom=yellow_limits[1], top=yellow_limits[1] + 100, fill_color='gold', fill_alpha=0.2)
+            yellow_high = BoxAnnotation(bottom=yellow_limits[1], fill_color='gold', fill_alpha=0.2)
             fig.add_layout(yellow_high)
-            yellow_low = BoxAnnotation(bottom=yellow_limits[0] - 100, top=yellow_limits[0], fill_color='gold', fill_alpha=0.2)
+            yellow_low = BoxAnnotation(top=yellow_limits[0], fill_color='gold', fill_alpha=0.2)
             fig.add_layout(yellow_low)
     else:
         if red is not None:
             green = BoxAnnotation(bottom=red_limits[0], top=red_limits[1], fill_color='chartreuse', fill_alpha=0.2)
             fig.add_layout(green)
-            red_high = BoxAnnotation(bottom=red_limits[1], top=red_limits[1] + 100, fill_color='red', fill_alpha=0.1)
+            red_high = BoxAnnotation(bottom=red_limits[1], fill_color='red', fill_alpha=0.1)
             fig.add_layout(red_high)
-            red_low = BoxAnnotation(bottom=red_limits[0] - 100, top=red_limits[0], fill_color='red', fill_alpha=0.1)
+            red_low = BoxAnnotation(top=red_limits[0], fill_color='red', fill_alpha=0.1)
             fig.add_layout(red_low)
     return fig
 
@@ -280,7 +281,7 @@ def generic_telemetry_plot(times, values, name, nominal_value=None, yellow_limit
     fig.circle(times, values, size=4, color='navy', alpha=0.5)
 
     if nominal_value is not None:
-        fig.line(times, np.repeat(nominal_value, len(times)), line_dash='dashed')
+        fig.add_layout(Span(location=nominal_value, dimension='width', line_dash='dashed'))
 
     fig.xaxis.formatter = DatetimeTickFormatter(hours=["%d %b %H:%M"],
                                                 days=["%d %b %H:%M"],